@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+"""
+Ch2 설교 자료 업로더 핵심 라이브러리 (Streamlit 비의존)
+- bible / bible_compact: 성경 책/장 정보, 본문 로더, 압축 포맷
+- storage: GitHub contents API 저장소 (configure()로 설정 주입)
+- materials: 자료 항목, 첨부 파일 업로드/분리, 이미지 가져오기
+- submission: 제출 직렬화, 저장 경로, 날짜별 제출본 조회
+- docx_render: Word 문서 생성 / slides: 프로젝터 슬라이드 / export: 날짜별 ZIP
+무거운 의존성(requests, python-docx, Pillow)은 실제로 쓰는 함수 안에서 import 하므로
+이 패키지를 import 하는 것만으로는 로드되지 않는다.
+"""
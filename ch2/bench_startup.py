@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+시작 시간/재실행(import) 오버헤드 측정
+- 콜드 스타트: 새 파이썬 프로세스에서 모듈을 import 하는 데 걸리는 시간 (여러 번 중 최솟값)
+  · eager: 예전 ch_test.py처럼 python-docx/Pillow/requests를 맨 위에서 import
+  · core : ch2 패키지 전체 import (무거운 의존성은 지연 import)
+- 재실행: Streamlit은 상호작용마다 스크립트를 다시 실행하므로, 이미 로드된 모듈의 재-import 비용을 측정
+- --app 을 주면 streamlit.testing 의 AppTest로 실제 앱의 첫 실행/재실행 시간도 측정
+
+사용법:
+    python -m ch2.bench_startup
+    python -m ch2.bench_startup --app ch_test.py
+"""
+
+import argparse, os, subprocess, sys, time
+from typing import Optional, List
+
+EAGER = "import docx, docx.shared, docx.enum.text, PIL.Image, requests"
+CORE = ("import ch2.bible, ch2.bible_compact, ch2.storage, ch2.materials, "
+        "ch2.submission, ch2.docx_render, ch2.slides, ch2.export")
+CORE_MODULES = CORE.replace("import ", "").split(", ")
+
+
+def cold_import_s(code: str, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], check=True)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def warm_import_s(modules: List[str], repeat: int = 1000) -> float:
+    import importlib
+    for m in modules:
+        importlib.import_module(m)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for m in modules:
+            importlib.import_module(m)
+    return (time.perf_counter() - t0) / repeat
+
+
+def app_run_s(path: str, reruns: int = 5):
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(os.path.abspath(path), default_timeout=120)
+    for k in ("GITHUB_TOKEN", "GITHUB_OWNER", "GITHUB_REPO"):
+        at.secrets[k] = "bench"
+    at.session_state["authenticated"] = True
+    at.session_state["role"] = "교역자"
+    at.session_state["can_edit"] = True
+    t0 = time.perf_counter()
+    at.run()
+    first = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for _ in range(reruns):
+        at.run()
+    return first, (time.perf_counter() - t0) / reruns
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="콜드 스타트/재실행 import 오버헤드 측정")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--app", help="AppTest로 측정할 Streamlit 스크립트 경로")
+    args = ap.parse_args(argv)
+
+    base = cold_import_s("pass", args.repeat)
+    eager = cold_import_s(EAGER, args.repeat)
+    core = cold_import_s(CORE, args.repeat)
+    print(f"python 기동          : {base * 1000:8.1f} ms")
+    print(f"eager import (이전)  : {(eager - base) * 1000:8.1f} ms (기동 제외)")
+    print(f"ch2 core import (이후): {(core - base) * 1000:8.1f} ms (기동 제외)")
+    print(f"재실행 시 재-import   : {warm_import_s(CORE_MODULES) * 1e6:8.1f} µs")
+    if args.app:
+        first, rerun = app_run_s(args.app)
+        print(f"앱 첫 실행            : {first * 1000:8.1f} ms")
+        print(f"앱 재실행 평균        : {rerun * 1000:8.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+성경 책/장 정보 + 본문 로더
+- 본문은 책 단위 압축 포맷({GITHUB_BIBLE_COMPACT_DIR}/{book_code}.json)을 우선 사용하고,
+  해당 책/장이 없으면 장별 JSON({GITHUB_BIBLE_DIR}/{book_code}_{chap:03d}.json)으로 대체
+- 캐시는 호출하는 쪽(Streamlit 앱은 st.cache_data)에서 건다
+"""
+
+import json, re
+from typing import List, Dict, Any, Optional, Tuple
+
+from . import bible_compact, storage
+
+BOOKS = {
+    # OT
+    "창세기":"gen","출애굽기":"exo","레위기":"lev","민수기":"num","신명기":"deu",
+    "여호수아":"jos","사사기":"jdg","룻기":"rut","사무엘상":"1sa","사무엘하":"2sa",
+    "열왕기상":"1ki","열왕기하":"2ki","역대상":"1ch","역대하":"2ch","에스라":"ezr",
+    "느헤미야":"neh","에스더":"est","욥기":"job","시편":"psa","잠언":"pro",
+    "전도서":"ecc","아가":"sng","이사야":"isa","예레미야":"jer","예레미야애가":"lam",
+    "에스겔":"ezk","다니엘":"dan","호세아":"hos","요엘":"jol","아모스":"amo",
+    "오바댜":"oba","요나":"jnh","미가":"mic","나훔":"nam","하박국":"hab",
+    "스바냐":"zep","학개":"hag","스가랴":"zec","말라기":"mal",
+    # NT
+    "마태복음":"mat","마가복음":"mrk","누가복음":"luk","요한복음":"jhn","사도행전":"act",
+    "로마서":"rom","고린도전서":"1co","고린도후서":"2co","갈라디아서":"gal","에베소서":"eph",
+    "빌립보서":"php","골로새서":"col","데살로니가전서":"1th","데살로니가후서":"2th","디모데전서":"1ti",
+    "디모데후서":"2ti","디도서":"tit","빌레몬서":"phm","히브리서":"heb","야고보서":"jas",
+    "베드로전서":"1pe","베드로후서":"2pe","요한1서":"1jn","요한2서":"2jn","요한3서":"3jn",
+    "유다서":"jud","요한계시록":"rev"
+}
+CHAPTER_COUNT = {
+    "창세기":50,"출애굽기":40,"레위기":27,"민수기":36,"신명기":34,"여호수아":24,"사사기":21,"룻기":4,"사무엘상":31,"사무엘하":24,
+    "열왕기상":22,"열왕기하":25,"역대상":29,"역대하":36,"에스라":10,"느헤미야":13,"에스더":10,"욥기":42,"시편":150,"잠언":31,
+    "전도서":12,"아가":8,"이사야":66,"예레미야":52,"예레미야애가":5,"에스겔":48,"다니엘":12,"호세아":14,"요엘":3,"아모스":9,
+    "오바댜":1,"요나":4,"미가":7,"나훔":3,"하박국":3,"스바냐":3,"학개":2,"스가랴":14,"말라기":4,
+    "마태복음":28,"마가복음":16,"누가복음":24,"요한복음":21,"사도행전":28,"로마서":16,"고린도전서":16,"고린도후서":13,"갈라디아서":6,"에베소서":6,
+    "빌립보서":4,"골로새서":4,"데살로니가전서":5,"데살로니가후서":3,"디모데전서":6,"디모데후서":4,"디도서":3,"빌레몬서":1,"히브리서":13,"야고보서":5,
+    "베드로전서":5,"베드로후서":3,"요한1서":5,"요한2서":1,"요한3서":1,"유다서":1,"요한계시록":22
+}
+
+# 개역개정 약어 → 책 이름
+BOOK_ABBR = {
+    "창":"창세기","출":"출애굽기","레":"레위기","민":"민수기","신":"신명기","수":"여호수아","삿":"사사기","룻":"룻기",
+    "삼상":"사무엘상","삼하":"사무엘하","왕상":"열왕기상","왕하":"열왕기하","대상":"역대상","대하":"역대하","스":"에스라",
+    "느":"느헤미야","에":"에스더","욥":"욥기","시":"시편","잠":"잠언","전":"전도서","아":"아가","사":"이사야",
+    "렘":"예레미야","애":"예레미야애가","겔":"에스겔","단":"다니엘","호":"호세아","욜":"요엘","암":"아모스",
+    "옵":"오바댜","욘":"요나","미":"미가","나":"나훔","합":"하박국","습":"스바냐","학":"학개","슥":"스가랴","말":"말라기",
+    "마":"마태복음","막":"마가복음","눅":"누가복음","요":"요한복음","행":"사도행전","롬":"로마서","고전":"고린도전서",
+    "고후":"고린도후서","갈":"갈라디아서","엡":"에베소서","빌":"빌립보서","골":"골로새서","살전":"데살로니가전서",
+    "살후":"데살로니가후서","딤전":"디모데전서","딤후":"디모데후서","딛":"디도서","몬":"빌레몬서","히":"히브리서",
+    "약":"야고보서","벧전":"베드로전서","벧후":"베드로후서","요일":"요한1서","요이":"요한2서","요삼":"요한3서",
+    "유":"유다서","계":"요한계시록"
+}
+_BOOK_TOKENS = {**{name: code for name, code in BOOKS.items()},
+                **{abbr: BOOKS[name] for abbr, name in BOOK_ABBR.items()},
+                **{code: code for code in BOOKS.values()}}
+# 긴 이름부터 맞춰야 "요한1서"가 "요"로, "사무엘상"이 "사"로 잘리지 않는다
+_REF = re.compile(
+    r"(?<![0-9A-Za-z가-힣])(" + "|".join(re.escape(t) for t in sorted(_BOOK_TOKENS, key=len, reverse=True)) + r")"
+    r"\s*(\d+)(?:\s*:\s*(\d+)(?:\s*-\s*(\d+))?)?"
+)
+
+# 성경 선택기가 본문 내용에 넣는 줄: "{책 이름} {장}:{절} 본문" (verse_lines/parallel_verse_lines)
+_PICKER_LINE = re.compile(
+    r"^(" + "|".join(re.escape(n) for n in sorted(BOOKS, key=len, reverse=True)) + r") (\d+):(\d+)(?: |$)"
+)
+
+
+def bible_json_dir() -> str:
+    return storage.setting("GITHUB_BIBLE_DIR", "bsk_json")
+
+
+def bible_compact_dir() -> str:
+    return storage.setting("GITHUB_BIBLE_COMPACT_DIR", "bsk_compact")
+
+
+def get_book_code(book_name: str) -> str:
+    code = BOOKS.get(book_name)
+    if not code:
+        raise ValueError(f"알 수 없는 책 이름: {book_name}")
+    return code
+
+
+def find_references(text: str, strict: bool = False) -> List[Tuple[str, int, Optional[int], Optional[int]]]:
+    """본문에서 "열왕기상 19:1", "왕상 19:1-8", "1ki 19" 같은 참조를 찾아 (책 코드, 장, 시작절, 끝절) 목록으로 반환.
+
+    strict면 약어/코드는 "장:절" 형태일 때만 인정한다 — 설교 전문 같은 자유 글에서
+    "시 3번째", "전 2곡"처럼 한 글자 약어 + 숫자가 참조로 잡히지 않게.
+    """
+    refs = []
+    for m in _REF.finditer(text or ""):
+        if strict and m.group(1) not in BOOKS and not m.group(3):
+            continue
+        v_from = int(m.group(3)) if m.group(3) else None
+        v_to = int(m.group(4)) if m.group(4) else v_from
+        refs.append((_BOOK_TOKENS[m.group(1)], int(m.group(2)), v_from, v_to))
+    return refs
+
+
+def picker_references(verse_text: str) -> Tuple[List[Tuple[str, int, int, int]], str]:
+    """성경 선택기가 넣은 줄에서 참조를 뽑고(연속된 절은 한 범위로), 나머지 줄(직접 입력한 글)을 함께 반환."""
+    refs: List[Tuple[str, int, int, int]] = []
+    rest: List[str] = []
+    for line in (verse_text or "").splitlines():
+        m = _PICKER_LINE.match(line)
+        if not m:
+            if not line.startswith("  ["):  # 나란히 보기의 다른 번역본 줄
+                rest.append(line)
+            continue
+        code, chap, verse = BOOKS[m.group(1)], int(m.group(2)), int(m.group(3))
+        if refs and refs[-1][:2] == (code, chap) and refs[-1][3] + 1 == verse:
+            refs[-1] = (code, chap, refs[-1][2], verse)
+        else:
+            refs.append((code, chap, verse, verse))
+    return refs, "\n".join(rest)
+
+
+def parse_reference(text: str) -> Optional[Tuple[str, int, Optional[int], Optional[int]]]:
+    refs = find_references((text or "").strip())
+    return refs[0] if refs else None
+
+
+def book_name_of(book_code: str) -> str:
+    return next((name for name, code in BOOKS.items() if code == book_code), book_code)
+
+
+def load_compact_book(book_code: str) -> Optional[Dict[str, Any]]:
+    try:
+        return bible_compact.loads_compact(storage.gh_get_raw(f"{bible_compact_dir()}/{book_code}.json"))
+    except FileNotFoundError:
+        return None
+
+
+def load_chapter_file(book_code: str, chap: int) -> Dict[str, Any]:
+    json_path = f"{bible_json_dir()}/{book_code}_{chap:03d}.json"
+    return json.loads(storage.gh_get_bytes(json_path).decode("utf-8"))
+
+
+def verse_lines(book_name: str, chap: int, data: Dict[str, Any], v_from: int, v_to: int) -> List[str]:
+    lines = []
+    for v in data.get("verses", []):
+        vn = v.get("verse")
+        if vn is not None and v_from <= vn <= v_to:
+            lines.append(f"{book_name} {chap}:{vn} {v.get('text','').strip()}")
+    return lines
+
+
+def parallel_verse_lines(book_name: str, chap: int, rows: List[Dict[str, Any]], versions: List[str]) -> List[str]:
+    """첫 번역본은 "책 장:절 본문", 나머지 번역본은 그 아래 "  [번역본] 본문" 줄로 붙인다."""
+    lines = []
+    for r in rows:
+        lines.append(f"{book_name} {chap}:{r['verse']} {(r[versions[0]] or '').strip()}")
+        lines.extend(f"  [{ver}] {r[ver].strip()}" for ver in versions[1:] if r[ver])
+    return lines
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+성경 장(chapter) JSON → 책 단위 압축/정규화 포맷 변환기 + 로더
+- 입력: 1ch_001.json(book_code/chapter) 또는 bsk_json/gen_001.json(book/chap) 형식의 장별 JSON
+- 출력: {out_dir}/{book_code}.json — 책 하나에 장 전체, 공백 없는 JSON
+- 여러 번역본(장별 JSON의 version 필드)을 한 파일에 열(column) 단위로 저장
+  · chapter_offsets로 (장, 절) → 절 ID(책 안의 일련번호)를 계산하고, 모든 번역본 열이 같은 절 ID로 정렬됨
+  · 한 범위를 여러 번역본으로 읽을 때 번역본마다 같은 구간을 한 번씩 잘라 읽기만 하면 됨
+- 본문의 각주 표시("1) ...")와 본문 끝에 붙은 각주 내용("히 , 로고스")을 분리해 footnotes에 따로 기록
+- 빈 comments 목록, 절 번호 등 반복 필드는 저장하지 않음 (누락 절은 null)
+
+사용법:
+    python -m ch2.bible_compact convert . bsk_json --out bsk_compact
+    python -m ch2.bible_compact convert . bsk_json bsk_json_niv --out bsk_compact   # 번역본 추가
+    python -m ch2.bible_compact bench . bsk_json --out bsk_compact
+"""
+
+import argparse, glob, json, os, re, sys, time
+from typing import List, Dict, Any, Optional, Tuple
+
+COMPACT_FORMAT = "ch2-compact/2"
+
+# 숫자 각주 "1) " 와 관주(교차 참조) "ㄱ) "
+_MARKER = re.compile(r"\s*(\d+|[ㄱ-ㅎ])\)\s+")
+# 각주 내용이 시작될 때 흔히 쓰이는 머리말 (원어, 이본, 대안 번역, 관주 "사 64:4")
+_NOTE_HEAD = re.compile(r"\s(?=(?:히|헬)\s*,|아람\s?어|어떤 사본에|또는\s|원문에|칠십인|[가-힣]{1,2} \d+:\d+)")
+# 이어 붙은 여러 각주를 나눌 때는 각주 안에서도 쓰이는 "또는"을 제외한 머리말만 사용
+_NOTE_SPLIT = re.compile(r"\s(?=(?:히|헬)\s*,|어떤 사본에|칠십인|[가-힣]{1,2} \d+:\d+)")
+# 본문 마지막 어절의 종결/연결 어미 — 각주 머리말이 없을 때 본문/각주 경계를 추정하는 데 사용
+_SENTENCE_END = re.compile(r"(?:라|다|까|냐|니|며|매|고)(?=\s)")
+_MAX_BARE_NOTE_WORDS = 5  # 머리말 없는 각주는 "초장", "유브라데 강"처럼 짧다
+_SPACE_BEFORE_PUNCT = re.compile(r"\s+([,.;:!?])")
+_MULTI_SPACE = re.compile(r"\s{2,}")
+
+
+def _tidy(text: str) -> str:
+    return _MULTI_SPACE.sub(" ", _SPACE_BEFORE_PUNCT.sub(r"\1", text)).strip()
+
+
+def split_footnotes(text: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """본문에서 각주 표시/내용을 떼어내 (정리된 본문, 각주 목록)을 반환.
+
+    각주 목록의 항목은 {"n": 표시("1", "ㄱ"), "anchor": 표시 바로 뒤 어절, "note": 각주 내용}.
+    원문에는 구분자가 없으므로 경계는 휴리스틱으로 추정하며, 찾지 못하면 note는 빈 문자열이다.
+    """
+    markers = list(_MARKER.finditer(text or ""))
+    if not markers:
+        return _tidy(text or ""), []
+
+    last = markers[-1]
+    tail_start = last.end()
+    body_end = len(text)
+    m = _NOTE_HEAD.search(text, tail_start)
+    if m:
+        body_end = m.start()
+    else:
+        # 각주 내용에는 어미가 거의 없으므로 마지막 어미까지를 본문으로 본다
+        # 추정한 각주가 너무 길면 본문을 잘라 먹을 위험이 있으므로 나누지 않는다
+        ends = list(_SENTENCE_END.finditer(text, tail_start))
+        if ends and len(text[ends[-1].end():].split()) <= _MAX_BARE_NOTE_WORDS:
+            body_end = ends[-1].end()
+    body, notes_text = text[:body_end], _tidy(text[body_end:])
+
+    # 여러 각주가 이어 붙은 경우 머리말 기준으로 나누고, 개수가 맞지 않으면 첫 각주에 전부 둔다
+    notes = [n for n in (_tidy(p) for p in _NOTE_SPLIT.split(" " + notes_text)) if n] if notes_text else []
+    if len(notes) != len(markers):
+        notes = [notes_text] + [""] * (len(markers) - 1)
+
+    footnotes = []
+    for marker, note in zip(markers, notes):
+        anchor = body[marker.end():].split(" ", 1)[0] if marker.end() < len(body) else ""
+        footnotes.append({"n": marker.group(1), "anchor": _tidy(anchor), "note": note})
+    return _tidy(_MARKER.sub(" ", body)), footnotes
+
+
+def _read_chapter(path: str) -> Optional[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    code = data.get("book_code") or data.get("book")
+    chap = data.get("chapter") or data.get("chap")
+    if not code or not chap or "verses" not in data:
+        return None
+    return {
+        "book": code,
+        "book_name": data.get("book_name", ""),
+        "chapter": int(chap),
+        "version": data.get("version", ""),
+        "verses": data["verses"],
+    }
+
+
+def compact_book(chapters: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """같은 책의 장 목록(번역본 여러 개 가능)을 열 단위 압축 포맷 dict로 변환."""
+    chapters = sorted(chapters, key=lambda c: c["chapter"])
+    versions: List[str] = []
+    for ch in chapters:
+        if ch["version"] not in versions:
+            versions.append(ch["version"])
+
+    # 장마다 번역본 중 가장 긴 절 수를 기준으로 절 ID 구간을 잡는다 (번역본 간 절 구분 차이는 null로 채움)
+    n_chapters = chapters[-1]["chapter"]
+    counts = [0] * n_chapters
+    for ch in chapters:
+        n_verses = max((int(v["verse"]) for v in ch["verses"]), default=0)
+        counts[ch["chapter"] - 1] = max(counts[ch["chapter"] - 1], n_verses)
+    offsets = [0]
+    for n in counts:
+        offsets.append(offsets[-1] + n)
+
+    columns: Dict[str, List[Optional[str]]] = {ver: [None] * offsets[-1] for ver in versions}
+    footnotes: Dict[str, List[List[Any]]] = {ver: [] for ver in versions}
+    for ch in chapters:
+        col, base = columns[ch["version"]], offsets[ch["chapter"] - 1]
+        for v in ch["verses"]:
+            clean, notes = split_footnotes(v.get("text", ""))
+            col[base + int(v["verse"]) - 1] = clean
+            for fn in notes:
+                footnotes[ch["version"]].append([ch["chapter"], int(v["verse"]), fn["n"], fn["anchor"], fn["note"]])
+    return {
+        "format": COMPACT_FORMAT,
+        "book": chapters[0]["book"],
+        "book_name": chapters[0]["book_name"],
+        "versions": versions,
+        "chapter_offsets": offsets,
+        "text": columns,
+        "footnotes": {ver: fns for ver, fns in footnotes.items() if fns},
+    }
+
+
+def dumps_compact(book: Dict[str, Any]) -> bytes:
+    return json.dumps(book, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_compact(raw: bytes) -> Dict[str, Any]:
+    book = json.loads(raw.decode("utf-8") if isinstance(raw, bytes) else raw)
+    if book.get("format") != COMPACT_FORMAT:
+        raise ValueError(f"지원하지 않는 성경 포맷: {book.get('format')} (bible_compact.py convert로 다시 변환하세요)")
+    return book
+
+
+def chapter_span(book: Dict[str, Any], chap: int) -> Optional[Tuple[int, int]]:
+    """장의 절 ID 구간 [start, end). 책에 없는 장이면 None."""
+    offsets = book.get("chapter_offsets") or [0]
+    if not (1 <= chap < len(offsets)) or offsets[chap] == offsets[chap - 1]:
+        return None
+    return offsets[chap - 1], offsets[chap]
+
+
+def read_range(book: Dict[str, Any], chap: int, v_from: int, v_to: int,
+               versions: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """chap:v_from-v_to 를 여러 번역본으로 읽어 [{"verse", 번역본: 본문, ...}] 으로 반환.
+
+    모든 번역본 열이 같은 절 ID로 정렬되어 있으므로 번역본마다 같은 구간 슬라이스 한 번이면 된다.
+    """
+    span = chapter_span(book, chap)
+    if span is None:
+        return []
+    versions = [v for v in (versions or book.get("versions", [])[:1]) if v in book.get("text", {})]
+    start = span[0] + max(v_from, 1) - 1
+    end = min(span[0] + v_to, span[1])
+    cols = {ver: book["text"][ver][start:end] for ver in versions}
+    rows = []
+    for i in range(max(end - start, 0)):
+        row = {"verse": start - span[0] + i + 1}
+        row.update({ver: cols[ver][i] for ver in versions})
+        if any(row[ver] is not None for ver in versions):
+            rows.append(row)
+    return rows
+
+
+def chapter_from_compact(book: Dict[str, Any], chap: int, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """압축 포맷에서 한 장을 기존 장별 JSON과 같은 모양({"verses": [{"verse", "text"}]})으로 꺼낸다."""
+    span = chapter_span(book, chap)
+    version = version or (book.get("versions") or [None])[0]
+    if span is None or version not in book.get("text", {}):
+        return None
+    rows = read_range(book, chap, 1, span[1] - span[0], [version])
+    if not rows:
+        return None
+    footnotes = [
+        {"verse": v, "n": n, "anchor": a, "note": note}
+        for c, v, n, a, note in book.get("footnotes", {}).get(version, []) if c == chap
+    ]
+    return {
+        "book_code": book["book"],
+        "book_name": book.get("book_name", ""),
+        "chapter": chap,
+        "version": version,
+        "verses": [{"verse": r["verse"], "text": r[version]} for r in rows],
+        "footnotes": footnotes,
+    }
+
+
+def collect_chapters(src_dirs: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    books: Dict[str, Dict[Tuple[str, int], Dict[str, Any]]] = {}
+    for src in src_dirs:
+        for path in sorted(glob.glob(os.path.join(src, "*.json"))):
+            try:
+                ch = _read_chapter(path)
+            except (ValueError, UnicodeDecodeError):
+                ch = None
+            if ch:
+                books.setdefault(ch["book"], {})[(ch["version"], ch["chapter"])] = ch
+    return {code: list(chs.values()) for code, chs in books.items()}
+
+
+def convert(src_dirs: List[str], out_dir: str) -> List[str]:
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for code, chapters in sorted(collect_chapters(src_dirs).items()):
+        path = os.path.join(out_dir, f"{code}.json")
+        with open(path, "wb") as f:
+            f.write(dumps_compact(compact_book(chapters)))
+        written.append(path)
+    return written
+
+
+def bench(src_dirs: List[str], out_dir: str, repeat: int = 5) -> Dict[str, float]:
+    """원본 장별 JSON 전체와 압축 포맷 전체의 크기/파싱 시간을 비교."""
+    src_files = [p for src in src_dirs for p in sorted(glob.glob(os.path.join(src, "*.json")))]
+    out_files = sorted(glob.glob(os.path.join(out_dir, "*.json")))
+    src_raw = [open(p, "rb").read() for p in src_files]
+    out_raw = [open(p, "rb").read() for p in out_files]
+
+    def _time(raws, loader):
+        best = float("inf")
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            for raw in raws:
+                loader(raw)
+            best = min(best, time.perf_counter() - t0)
+        return best
+
+    return {
+        "src_files": len(src_files),
+        "src_bytes": sum(map(len, src_raw)),
+        "src_parse_s": _time(src_raw, json.loads),
+        "compact_files": len(out_files),
+        "compact_bytes": sum(map(len, out_raw)),
+        "compact_parse_s": _time(out_raw, loads_compact),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="성경 장 JSON을 책 단위 압축 포맷으로 변환")
+    ap.add_argument("command", choices=["convert", "bench"])
+    ap.add_argument("src", nargs="+", help="장별 JSON이 있는 디렉터리들 (뒤에 오는 것이 우선)")
+    ap.add_argument("--out", default="bsk_compact")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    if args.command == "convert":
+        for path in convert(args.src, args.out):
+            print(path)
+    else:
+        r = bench(args.src, args.out, repeat=args.repeat)
+        print(f"원본  : {r['src_files']:4d}개 {r['src_bytes']:>10,d} bytes  파싱 {r['src_parse_s'] * 1000:8.2f} ms")
+        print(f"압축  : {r['compact_files']:4d}개 {r['compact_bytes']:>10,d} bytes  파싱 {r['compact_parse_s'] * 1000:8.2f} ms")
+        if r["compact_bytes"]:
+            print(f"크기 비율: {r['compact_bytes'] / r['src_bytes']:.2%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Word(DOCX) 문서 생성
+- build_docx: 제출본 하나의 설교 자료 문서
+- build_master_docx: 날짜/예배별 통합 순서지 (여러 제출본의 submission.json으로 생성)
+- python-docx는 문서를 만들 때 처음 import (모듈 import만으로는 로드하지 않음)
+"""
+
+import importlib.util, io, re
+from datetime import date
+from typing import List, Dict, Any, Optional
+
+from .materials import fetch_material_images, material_image_bytes
+from .submission import group_submissions_by_service
+
+
+def docx_available() -> bool:
+    return importlib.util.find_spec("docx") is not None
+
+
+def add_rich_text(paragraph, text: str):
+    if not text:
+        return
+    pattern = r'(\*\*.*?\*\*|==.*?==)'
+    parts = re.split(pattern, text)
+    for part in parts:
+        if not part:
+            continue
+        if part.startswith("**") and part.endswith("**"):
+            run = paragraph.add_run(part[2:-2])
+            run.bold = True
+        elif part.startswith("==") and part.endswith("=="):
+            run = paragraph.add_run(part[2:-2])
+            try:
+                from docx.enum.text import WD_COLOR_INDEX
+                run.font.highlight_color = WD_COLOR_INDEX.YELLOW
+            except Exception:
+                pass
+        else:
+            paragraph.add_run(part)
+
+
+def render_material(doc, heading: str, item: Dict[str, Any], image_cache: Dict[str, bytes], level: int = 2):
+    from docx.shared import Inches
+
+    kind = item.get("kind", "")
+    verse_text = item.get("verse_text", "") or ""
+    description = item.get("description", "") or ""
+    full_text = item.get("full_text", "") or ""
+    files = item.get("files", []) or []
+    single_file = item.get("file")
+
+    doc.add_heading(heading, level=level)
+
+    if kind == "성경 구절":
+        if verse_text.strip():
+            for line in verse_text.splitlines():
+                p = doc.add_paragraph()
+                add_rich_text(p, line)
+            doc.add_paragraph("")
+        else:
+            doc.add_paragraph("(성경 구절 미입력)")
+
+    elif kind == "이미지":
+        if files:
+            for f in files:
+                try:
+                    # 같은 바이트는 python-docx가 sha1로 image part를 재사용하므로 문서에 한 번만 포함된다
+                    img_bytes = material_image_bytes(f, image_cache)
+                    if img_bytes is not None:
+                        doc.add_picture(io.BytesIO(img_bytes), width=Inches(5))
+                except Exception:
+                    doc.add_paragraph(
+                        f"(이미지 삽입 실패) 파일: "
+                        f"{(f.get('name') if isinstance(f, dict) else getattr(f, 'name', 'unknown'))}"
+                    )
+        else:
+            doc.add_paragraph("(이미지 파일 없음)")
+
+    elif kind == "기타 파일":
+        if isinstance(single_file, dict) and "name" in single_file:
+            doc.add_paragraph(f"첨부 파일: {single_file['name']} (문서에 직접 삽입되지 않습니다)")
+        elif single_file is not None and hasattr(single_file, "getvalue"):
+            doc.add_paragraph(f"첨부 파일: {getattr(single_file, 'name', '파일')} (문서에 직접 삽입되지 않습니다)")
+        else:
+            doc.add_paragraph("(첨부 파일 없음)")
+
+    elif kind == "설교 전문":
+        if full_text.strip():
+            for line in full_text.splitlines():
+                p = doc.add_paragraph()
+                add_rich_text(p, line)
+        else:
+            doc.add_paragraph("(설교 전문 미입력)")
+
+    p = doc.add_paragraph()
+    p.add_run("설명(스토리보드): ")
+    if description.strip():
+        add_rich_text(p, description)
+    else:
+        p.add_run("(미입력)")
+
+    doc.add_paragraph("")
+
+
+def _new_document(title_text: str):
+    try:
+        from docx import Document
+        from docx.shared import Pt
+        from docx.enum.text import WD_ALIGN_PARAGRAPH
+    except ImportError:
+        raise RuntimeError("python-docx가 설치되지 않았습니다. 'pip install python-docx' 실행 후 다시 시도해주세요.")
+    doc = Document()
+
+    style = doc.styles['Normal']
+    style.font.name = '맑은 고딕'
+    style.font.size = Pt(11)
+
+    title = doc.add_paragraph()
+    run = title.add_run(title_text)
+    run.bold = True
+    run.font.size = Pt(20)
+    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    return doc
+
+
+def _docx_bytes(doc) -> bytes:
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    buffer.seek(0)
+    return buffer.read()
+
+
+def build_docx(worship_date: date, services: List[str], materials: List[Dict[str, Any]],
+               user_name: str, position: str, role: str,
+               image_cache: Optional[Dict[str, bytes]] = None) -> bytes:
+    doc = _new_document("설교 자료")
+    image_cache = fetch_material_images(materials, cache=image_cache)
+
+    meta = doc.add_paragraph()
+    meta.add_run(f"날짜: {worship_date.strftime('%Y-%m-%d')}\n").bold = True
+    meta.add_run("예배 구분: " + (", ".join(services) if services else "(미선택)") + "\n").bold = True
+    if user_name or position or role:
+        meta.add_run(f"작성자/권한: {user_name or '(미입력)'} ({position or '직분 미선택'}) - {role or '권한 미지정'}").bold = True
+
+    doc.add_paragraph("")
+    doc.add_heading("자료 (스토리보드)", level=1)
+
+    if not materials:
+        doc.add_paragraph("(추가된 자료가 없습니다)")
+    else:
+        for idx, item in enumerate(materials, start=1):
+            render_material(doc, f"{idx}. {item.get('kind', '')}", item, image_cache)
+
+    return _docx_bytes(doc)
+
+
+def build_master_docx(worship_date: date, payloads: List[Dict[str, Any]], service: Optional[str] = None) -> bytes:
+    """여러 제출본의 submission.json으로 예배별 통합 순서지 DOCX를 만든다.
+
+    이미지는 모든 제출본에 대해 한 번에 받아 공유하므로, 같은 사진은 한 번만 받고 한 번만 포함된다.
+    """
+    grouped = group_submissions_by_service(payloads, service=service)
+    doc = _new_document("통합 순서지" + (f" — {service}" if service else ""))
+    doc.add_paragraph().add_run(f"날짜: {worship_date.strftime('%Y-%m-%d')}").bold = True
+
+    image_cache = fetch_material_images([m for subs in grouped.values() for p in subs for m in p.get("materials", [])])
+
+    if not grouped:
+        doc.add_paragraph("(제출된 자료가 없습니다)")
+    for svc, subs in grouped.items():
+        doc.add_heading(svc, level=1)
+        for payload in subs:
+            doc.add_heading(
+                f"{payload.get('user_name') or '(미입력)'} ({payload.get('position') or '직분 미선택'})",
+                level=2,
+            )
+            materials = payload.get("materials", [])
+            if not materials:
+                doc.add_paragraph("(추가된 자료가 없습니다)")
+            for idx, item in enumerate(materials, start=1):
+                render_material(doc, f"{idx}. {item.get('kind', '')}", item, image_cache, level=3)
+
+    return _docx_bytes(doc)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+날짜별 일괄 내보내기 (ZIP)
+- 하루치 제출물(submission.json/submission.docx/files/)을 하나의 ZIP으로 스트리밍 기록
+- 만드는 동안의 메모리는 파일 개수/크기와 무관하지만, Streamlit download_button은 내려받을 데이터를
+  통째로 서버 메모리(media_file_mgr)에 올리므로 화면에서 내려받는 ZIP은 zip_download_max()로 크기를 제한
+"""
+
+import os, shutil, tempfile, time, zipfile
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional
+
+from . import storage
+from .materials import MANIFEST_SUFFIX, PARTS_SUFFIX, THUMBS_DIR, stream_attachment_to
+
+ZIP_FETCH_WORKERS = 4
+ZIP_SPOOL_MAX = 8 * 1024 * 1024  # 파일당 메모리 상한, 초과분은 임시 디스크로
+# 이미 압축된 형식은 다시 deflate하지 않고 그대로 저장
+ZIP_STORED_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".docx", ".pptx", ".xlsx",
+                   ".pdf", ".zip", ".mp3", ".m4a", ".mp4", ".mov"}
+
+
+class ZipTooLarge(RuntimeError):
+    """ZIP이 max_bytes를 넘어 중단됨."""
+
+
+def zip_download_max() -> int:
+    return int(storage.setting("ZIP_DOWNLOAD_MAX_MB", 200)) * 1024 * 1024
+
+
+def _zip_fetch(item: Dict[str, Any]):
+    buf = tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_MAX)
+    try:
+        # 큰 첨부 파일(manifest)은 조각을 이어 붙여 원본 하나로 담는다
+        stream_attachment_to(item["path"], buf)
+        buf.seek(0)
+        return item, buf, None
+    except Exception as e:
+        buf.close()
+        return item, None, e
+
+
+def write_day_zip(day_dir: str, out_fileobj, include_drafts: bool = False,
+                  max_bytes: Optional[int] = None) -> int:
+    """day_dir 아래 제출물(JSON/DOCX/원본 파일)을 out_fileobj에 ZIP으로 기록하고 파일 수를 반환.
+
+    동시에 받아오는 파일은 최대 ZIP_FETCH_WORKERS*2개로 제한하고, 받은 순서대로 아카이브에
+    바로 써서 메모리 사용량이 파일 개수/크기와 무관하게 유지된다.
+    max_bytes를 주면 아카이브가 그보다 커지는 즉시 ZipTooLarge로 중단한다.
+    """
+    items = [
+        f for f in storage.gh_walk_files(day_dir, max_workers=ZIP_FETCH_WORKERS)
+        if (include_drafts or "/draft/" not in f["path"])
+        and f"{PARTS_SUFFIX}/" not in f["path"] and f"/{THUMBS_DIR}/" not in f["path"]
+    ]
+    items.sort(key=lambda f: f["path"])
+    errors: List[str] = []
+    written = 0
+    queue = iter(items)
+    with zipfile.ZipFile(out_fileobj, "w", compression=zipfile.ZIP_DEFLATED) as zf, \
+            ThreadPoolExecutor(max_workers=ZIP_FETCH_WORKERS) as ex:
+        pending = set()
+
+        def _fill():
+            while len(pending) < ZIP_FETCH_WORKERS * 2:
+                nxt = next(queue, None)
+                if nxt is None:
+                    return
+                pending.add(ex.submit(_zip_fetch, nxt))
+
+        _fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.discard(fut)
+                item, buf, err = fut.result()
+                if err is not None:
+                    errors.append(f"{item['path']}: {err}")
+                    continue
+                arcname = item["path"][len(day_dir):].lstrip("/")
+                if arcname.endswith(MANIFEST_SUFFIX):
+                    arcname = arcname[:-len(MANIFEST_SUFFIX)]
+                info = zipfile.ZipInfo(arcname, date_time=time.localtime()[:6])
+                ext = os.path.splitext(arcname)[1].lower()
+                info.compress_type = zipfile.ZIP_STORED if ext in ZIP_STORED_EXTS else zipfile.ZIP_DEFLATED
+                with buf, zf.open(info, "w", force_zip64=True) as dst:
+                    shutil.copyfileobj(buf, dst, 1024 * 1024)
+                written += 1
+                if max_bytes and out_fileobj.tell() > max_bytes:
+                    for rest in pending:
+                        rest.cancel()
+                    raise ZipTooLarge(f"ZIP이 {max_bytes // (1024 * 1024)}MB를 넘습니다.")
+            _fill()
+        if errors:
+            zf.writestr("_errors.txt", "\n".join(errors))
+    return written
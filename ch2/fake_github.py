@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+로컬 GitHub contents API 대역 서버 (부하 테스트/개발용)
+- ch2.storage가 쓰는 만큼만 흉내: 파일 GET(base64 JSON 또는 raw), 디렉터리 목록, PUT(sha 검사)
+  · 1MB 초과 파일은 실제 GitHub처럼 JSON의 content가 비어 있음 (encoding "none")
+  · 오래된 sha → 409, 이미 있는 파일에 sha 없이 PUT → 422
+- 지연 주입: 요청마다 latency_ms ± jitter_ms
+- 요청 한도 주입: 초당 rate_per_s 토큰 버킷(burst까지 누적), 초과 시 403 + X-RateLimit-Remaining: 0
+- 저장소는 메모리 dict (경로 → 바이트). --seed 로 로컬 폴더(예: bsk_compact)를 미리 넣을 수 있음
+- storage가 이 서버를 쓰게 하려면 GITHUB_API_URL=http://127.0.0.1:{port} 로 설정
+- GET /_stats — 요청 수/한도 초과/충돌 횟수
+
+사용법:
+    python -m ch2.fake_github --port 8765 --latency-ms 80 --rate-per-s 20 --seed bsk_compact
+"""
+
+import argparse, base64, hashlib, json, os, random, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlsplit
+
+INLINE_CONTENT_MAX = 1024 * 1024
+
+
+class FakeGitHub:
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 rate_per_s: Optional[float] = None, burst: Optional[int] = None):
+        self.files: Dict[str, bytes] = {}
+        self.lock = threading.Lock()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_per_s = rate_per_s
+        self.burst = burst or (int(rate_per_s) if rate_per_s else 0)
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self.stats = {"GET": 0, "PUT": 0, "rate_limited": 0, "conflicts": 0}
+
+    # ---------------------------
+    # 주입: 지연/요청 한도
+    # ---------------------------
+    def delay(self):
+        ms = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+    def take_token(self) -> bool:
+        if not self.rate_per_s:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate_per_s)
+            self._refilled = now
+            if self._tokens < 1:
+                self.stats["rate_limited"] += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    # ---------------------------
+    # 저장소
+    # ---------------------------
+    def seed(self, local_dir: str, prefix: Optional[str] = None):
+        prefix = prefix if prefix is not None else os.path.basename(os.path.normpath(local_dir))
+        for root, _, names in os.walk(local_dir):
+            for name in names:
+                full = os.path.join(root, name)
+                rel = os.path.relpath(full, local_dir).replace(os.sep, "/")
+                with open(full, "rb") as f:
+                    self.files[f"{prefix}/{rel}" if prefix else rel] = f.read()
+
+    def listing(self, path: str) -> List[Dict[str, str]]:
+        prefix = path.rstrip("/") + "/" if path else ""
+        entries: Dict[str, str] = {}
+        with self.lock:
+            for p in self.files:
+                if p.startswith(prefix):
+                    head, sep, _ = p[len(prefix):].partition("/")
+                    entries[head] = "dir" if sep else entries.get(head, "file")
+        return [{"name": n, "path": prefix + n, "type": t} for n, t in sorted(entries.items())]
+
+    def put(self, path: str, content: bytes, sha: Optional[str]) -> int:
+        with self.lock:
+            current = self.files.get(path)
+            if current is not None and not sha:
+                self.stats["conflicts"] += 1
+                return 422
+            if sha and (current is None or sha != blob_sha(current)):
+                self.stats["conflicts"] += 1
+                return 409
+            self.files[path] = content
+            return 201 if current is None else 200
+
+
+def blob_sha(content: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def make_handler(gh: FakeGitHub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, body: bytes = b"", content_type: str = "application/json", headers=None):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _json(self, status: int, obj):
+            self._send(status, json.dumps(obj, ensure_ascii=False).encode("utf-8"))
+
+        def _path(self) -> Optional[str]:
+            path = unquote(urlsplit(self.path).path)
+            _, sep, rest = path.partition("/contents/")
+            return rest.strip("/") if sep else None
+
+        def _admit(self) -> bool:
+            gh.delay()
+            if gh.take_token():
+                return True
+            self._send(403, b'{"message":"API rate limit exceeded"}', headers={"X-RateLimit-Remaining": "0"})
+            return False
+
+        def do_GET(self):
+            if urlsplit(self.path).path == "/_stats":
+                with gh.lock:
+                    stats = {**gh.stats, "files": len(gh.files)}
+                return self._json(200, stats)
+            with gh.lock:
+                gh.stats["GET"] += 1
+            path = self._path()
+            if path is None:
+                return self._json(404, {"message": "Not Found"})
+            if not self._admit():
+                return
+            with gh.lock:
+                content = gh.files.get(path)
+            if content is None:
+                items = gh.listing(path)
+                return self._json(200, items) if items else self._json(404, {"message": "Not Found"})
+            if "raw" in self.headers.get("Accept", ""):
+                return self._send(200, content, content_type="application/octet-stream")
+            inline = len(content) <= INLINE_CONTENT_MAX
+            self._json(200, {
+                "name": path.rsplit("/", 1)[-1], "path": path, "type": "file", "size": len(content),
+                "sha": blob_sha(content),
+                "encoding": "base64" if inline else "none",
+                "content": base64.b64encode(content).decode("ascii") if inline else "",
+            })
+
+        def do_PUT(self):
+            with gh.lock:
+                gh.stats["PUT"] += 1
+            path = self._path()
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if path is None:
+                return self._json(404, {"message": "Not Found"})
+            if not self._admit():
+                return
+            payload = json.loads(body)
+            status = gh.put(path, base64.b64decode(payload["content"]), payload.get("sha"))
+            if status == 409:
+                return self._json(409, {"message": f"{path} does not match"})
+            if status == 422:
+                return self._json(422, {"message": "Invalid request.\n\n\"sha\" wasn't supplied."})
+            self._json(status, {"content": {"path": path, "sha": blob_sha(gh.files[path])}})
+
+    return Handler
+
+
+def serve(gh: FakeGitHub, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """백그라운드 스레드에서 서버를 띄우고 반환 (server.server_port로 포트 확인, shutdown()으로 종료)."""
+    server = ThreadingHTTPServer((host, port), make_handler(gh))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="로컬 GitHub contents API 대역 서버")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--rate-per-s", type=float, default=None, help="초당 허용 요청 수 (기본: 제한 없음)")
+    ap.add_argument("--burst", type=int, default=None)
+    ap.add_argument("--seed", action="append", default=[], help="미리 넣을 로컬 폴더 (같은 이름 경로로 저장)")
+    args = ap.parse_args(argv)
+
+    gh = FakeGitHub(args.latency_ms, args.jitter_ms, args.rate_per_s, args.burst)
+    for d in args.seed:
+        gh.seed(d)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(gh))
+    server.daemon_threads = True
+    print(f"fake GitHub: GITHUB_API_URL=http://{args.host}:{server.server_port} ({len(gh.files)}개 파일)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
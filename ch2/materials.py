@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+자료(material) 항목 + 첨부 파일 업로드/분리
+- 자료 dict: {"id", "kind", "files", "file", "verse_text", "description", "full_text"}
+- 업로드 파일 객체는 getvalue()/name/type 을 가진 객체(Streamlit UploadedFile 등)면 된다
+- 업로드는 파일에서 조각씩 읽어 보내고, LARGE_FILE_CHUNK보다 큰 파일은 여러 조각 파일 + manifest로 저장
+  · {sha1[:10]}_{이름}.manifest.json — 원본 이름/크기/sha1과 조각 목록
+  · {sha1[:10]}_{이름}.parts/0000, 0001, ... — 조각 (경로가 내용 해시 기반이라 이미 있는 조각은 건너뜀)
+- 이미지 썸네일은 파일 해시별로 한 번 만들어 원본 옆 _thumbs/{sha1}.webp 에 저장하고 메타의 "thumb"에 기록
+  (예전 제출본처럼 썸네일이 없으면 보기만 해서는 만들지 않음 — 편집 화면에서 요청할 때 build_missing_thumbnail)
+"""
+
+import hashlib, io, json, mimetypes, os, uuid
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from typing import List, Dict, Any, Optional
+
+from . import storage, thumbnails
+
+MATERIAL_KINDS = ["성경 구절", "이미지", "기타 파일", "설교 전문"]
+
+LARGE_FILE_CHUNK = 16 * 1024 * 1024  # 조각 하나의 원본 크기 (contents API 한 요청 크기 제한 아래)
+MANIFEST_SUFFIX = ".manifest.json"
+PARTS_SUFFIX = ".parts"
+THUMBS_DIR = "_thumbs"
+_HASH_PIECE = 1024 * 1024
+
+
+def new_material() -> Dict[str, Any]:
+    return {
+        "id": str(uuid.uuid4()),
+        "kind": "성경 구절",
+        "files": [],
+        "file": None,
+        "verse_text": "",
+        "description": "",
+        "full_text": ""
+    }
+
+
+def sanitize_filename(name: str) -> str:
+    name = os.path.basename(name or "upload.bin")
+    return name.replace("/", "_").replace("\\", "_").strip()
+
+
+def _sha1(b: bytes) -> str:
+    return hashlib.sha1(b).hexdigest()
+
+
+def _as_stream(uploaded_file):
+    # UploadedFile은 read/seek을 지원하므로 getvalue()로 통째 복사하지 않고 그대로 읽는다
+    if hasattr(uploaded_file, "read") and hasattr(uploaded_file, "seek"):
+        return uploaded_file
+    return io.BytesIO(uploaded_file.getvalue())
+
+
+def _hash_stream(stream, chunk_size: int):
+    """한 번 훑으며 (전체 크기, 전체 sha1, 조각별 (크기, sha1) 목록)을 계산."""
+    stream.seek(0)
+    whole = hashlib.sha1()
+    parts = []
+    part, part_len = hashlib.sha1(), 0
+    while True:
+        piece = stream.read(min(_HASH_PIECE, chunk_size - part_len))
+        if not piece:
+            break
+        whole.update(piece)
+        part.update(piece)
+        part_len += len(piece)
+        if part_len == chunk_size:
+            parts.append((part_len, part.hexdigest()))
+            part, part_len = hashlib.sha1(), 0
+    if part_len:
+        parts.append((part_len, part.hexdigest()))
+    size = sum(n for n, _ in parts)
+    stream.seek(0)
+    return size, whole.hexdigest(), parts
+
+
+def upload_file_to_github(uploaded_file, dest_dir: str, msg_prefix: str = "[file]") -> dict:
+    if uploaded_file is None:
+        return {}
+    stream = _as_stream(uploaded_file)
+    size, sha1, parts = _hash_stream(stream, LARGE_FILE_CHUNK)
+    orig_name = getattr(uploaded_file, "name", "upload.bin")
+    safe_name = sanitize_filename(orig_name)
+    content_type = getattr(uploaded_file, "type", mimetypes.guess_type(orig_name)[0])
+    dest_path = f"{dest_dir}/{sha1[:10]}_{safe_name}"
+    meta = {
+        "name": orig_name,
+        "path": dest_path,
+        "size": size,
+        "content_type": content_type,
+        "sha1": sha1,
+    }
+
+    if len(parts) <= 1:
+        storage.gh_put_stream(dest_path, stream, size, message=f"{msg_prefix} upload {safe_name}")
+        return meta
+
+    # 큰 파일: 조각 단위로 올리고 manifest를 마지막에 기록 (manifest가 있으면 조각이 모두 있다는 뜻)
+    part_entries = []
+    offset = 0
+    for i, (part_len, part_sha1) in enumerate(parts):
+        part_path = f"{dest_path}{PARTS_SUFFIX}/{i:04d}"
+        stream.seek(offset)
+        storage.gh_put_stream(part_path, stream, part_len, skip_existing=True,
+                              message=f"{msg_prefix} upload {safe_name} ({i + 1}/{len(parts)})")
+        part_entries.append({"path": part_path, "size": part_len, "sha1": part_sha1})
+        offset += part_len
+    manifest_path = dest_path + MANIFEST_SUFFIX
+    manifest = {"format": "ch2-chunked/1", **meta, "chunk_size": LARGE_FILE_CHUNK, "parts": part_entries}
+    storage.gh_put_bytes(manifest_path, json.dumps(manifest, ensure_ascii=False).encode("utf-8"),
+                         message=f"{msg_prefix} upload {safe_name} manifest")
+    return {**meta, "path": manifest_path, "chunked": True}
+
+
+def stream_attachment_to(path: str, fileobj) -> int:
+    """첨부 파일을 fileobj에 기록. manifest 경로면 조각을 순서대로 이어 원본을 복원한다."""
+    if not path.endswith(MANIFEST_SUFFIX):
+        return storage.gh_stream_to(path, fileobj)
+    manifest = json.loads(storage.gh_get_raw(path).decode("utf-8"))
+    written = 0
+    for part in manifest["parts"]:
+        written += storage.gh_stream_to(part["path"], fileobj)
+    if written != manifest["size"]:
+        raise IOError(f"조각 크기 불일치: {path} ({written} != {manifest['size']})")
+    return written
+
+
+def attachment_bytes(path: str) -> bytes:
+    """첨부 파일 전체 바이트 (조각으로 나뉜 파일도 원본으로 복원)."""
+    buf = io.BytesIO()
+    stream_attachment_to(path, buf)
+    return buf.getvalue()
+
+
+def materials_upload_and_detach_files(materials: List[Dict[str, Any]], files_dir: str, msg_prefix: str) -> List[Dict[str, Any]]:
+    out = []
+    for m in materials:
+        m2 = deepcopy(m)
+        kind = m2.get("kind", "")
+
+        if kind == "이미지":
+            metas = []
+            files = m2.get("files") or []
+            for f in files:
+                if hasattr(f, "getvalue"):  # UploadedFile
+                    meta = upload_file_to_github(f, files_dir, msg_prefix)
+                    thumb = store_thumbnail(meta, _as_stream(f), msg_prefix)
+                    metas.append({**meta, "thumb": thumb} if thumb else meta)
+                elif isinstance(f, dict) and "path" in f:
+                    metas.append(f)
+            m2["files"] = metas
+            m2["file"] = None
+
+        elif kind == "기타 파일":
+            f = m2.get("file")
+            if hasattr(f, "getvalue"):
+                m2["file"] = upload_file_to_github(f, files_dir, msg_prefix)
+            elif isinstance(f, dict) and "path" in f:
+                pass
+            else:
+                m2["file"] = None
+
+        else:
+            if "files" in m2 and not isinstance(m2["files"], list):
+                m2["files"] = []
+            if "file" in m2 and not isinstance(m2["file"], (dict, type(None))):
+                m2["file"] = None
+
+        out.append(m2)
+    return out
+
+
+def image_key(f: Dict[str, Any]) -> str:
+    return f.get("sha1") or f["path"]
+
+
+def fetch_material_images(materials: List[Dict[str, Any]], cache: Optional[Dict[str, bytes]] = None,
+                          max_workers: int = 4) -> Dict[str, bytes]:
+    """이미지 자료의 원본을 sha1(없으면 경로) 기준으로 한 번씩만 동시에 받아 cache에 채운다."""
+    cache = {} if cache is None else cache
+    todo: Dict[str, str] = {}
+    for m in materials:
+        if m.get("kind") != "이미지":
+            continue
+        for f in m.get("files") or []:
+            if isinstance(f, dict) and "path" in f:
+                key = image_key(f)
+                if key not in cache and key not in todo:
+                    todo[key] = f["path"]
+
+    def _get(key: str):
+        try:
+            return key, attachment_bytes(todo[key])
+        except Exception:
+            return key, None
+
+    if todo:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            for key, data in ex.map(_get, list(todo)):
+                if data is not None:
+                    cache[key] = data
+    return cache
+
+
+def material_image_bytes(f, image_cache: Dict[str, bytes]) -> Optional[bytes]:
+    """파일 항목(업로드 메타 dict 또는 업로드 파일 객체)의 이미지 바이트."""
+    if isinstance(f, dict) and "path" in f:
+        data = image_cache.get(image_key(f))
+        if data is None:
+            data = image_cache[image_key(f)] = attachment_bytes(f["path"])
+        return data
+    if hasattr(f, "getvalue"):
+        return f.getvalue()
+    return None
+
+
+def thumbnail_path(f: Dict[str, Any]) -> str:
+    folder = f["path"].rsplit("/", 1)[0]
+    return f"{folder}/{THUMBS_DIR}/{image_key(f).replace('/', '_')}{thumbnails.thumbnail_ext()}"
+
+
+def store_thumbnail(f: Dict[str, Any], src, msg_prefix: str = "[thumb]") -> Optional[str]:
+    """src(원본 바이트 또는 파일 객체)로 썸네일을 만들어 저장하고 경로를 반환. 실패하면 None (업로드는 계속)."""
+    try:
+        if hasattr(src, "seek"):
+            src.seek(0)
+        data = thumbnails.make_thumbnail(src)
+        path = thumbnail_path(f)
+        storage.gh_put_stream(path, io.BytesIO(data), len(data), skip_existing=True,
+                              message=f"{msg_prefix} thumbnail {os.path.basename(f['path'])}")
+        return path
+    except Exception:
+        return None
+
+
+def material_thumbnail(f: Dict[str, Any]) -> Optional[bytes]:
+    """업로드 메타의 저장된 썸네일 바이트. 아직 없으면 None (원본은 받지 않음)."""
+    try:
+        return storage.gh_get_raw(f.get("thumb") or thumbnail_path(f))
+    except FileNotFoundError:
+        return None
+
+
+def build_missing_thumbnail(f: Dict[str, Any]) -> Optional[str]:
+    """썸네일이 없는 예전 업로드: 원본을 받아 썸네일을 만들어 저장하고 경로를 반환. 실패하면 None."""
+    try:
+        src = attachment_bytes(f["path"])
+    except Exception:
+        return None
+    return store_thumbnail(f, src)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+지난 제출본 검색 색인
+- 제출할 때마다 해당 제출본의 색인 레코드를 월별 조각 {GITHUB_BASE_DIR}/_index/{YYYY-MM}.json 에 갱신(upsert)
+- 레코드: 날짜/작성자/직분/예배/성경 참조/이미지·첨부 파일(이름, sha1)/자료 종류
+- 검색은 모든 월별 조각을 한 번 읽어 만든 조회표(lookup)로 수행 — 제출본 JSON을 하나씩 열 필요 없음
+- rebuild_index()로 기존 제출본 전체에서 색인을 다시 만들 수 있음
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import List, Dict, Any, Optional
+
+from . import bible, storage
+
+INDEX_FORMAT = "ch2-index/1"
+INDEX_DIR_NAME = "_index"
+
+
+def index_dir() -> str:
+    return f"{storage.base_dir()}/{INDEX_DIR_NAME}"
+
+
+def _shard_path(worship_date: str) -> str:
+    return f"{index_dir()}/{worship_date[:7]}.json"
+
+
+def submission_record(payload: Dict[str, Any], folder: str) -> Dict[str, Any]:
+    """submission.json payload에서 검색용 레코드를 뽑는다."""
+    refs, files, kinds = [], [], []
+    for m in payload.get("materials", []):
+        kinds.append(m.get("kind", ""))
+        # 선택기가 넣은 본문 줄은 그대로, 자유 글(직접 입력/설명/설교 전문)은 엄격한 형태만 참조로 인정
+        picked, typed = bible.picker_references(m.get("verse_text") or "")
+        free_text = "\n".join([typed, m.get("description") or "", m.get("full_text") or ""])
+        for code, chap, v_from, v_to in picked + bible.find_references(free_text, strict=True):
+            ref = [code, chap, v_from, v_to]
+            if ref not in refs:
+                refs.append(ref)
+        attached = list(m.get("files") or []) + ([m["file"]] if isinstance(m.get("file"), dict) else [])
+        for f in attached:
+            if isinstance(f, dict) and "path" in f:
+                entry = {"name": f.get("name"), "sha1": f.get("sha1"), "path": f["path"], "kind": m.get("kind", "")}
+                if entry not in files:
+                    files.append(entry)
+    return {
+        "key": folder,
+        "date": payload.get("worship_date", ""),
+        "user_name": payload.get("user_name") or "",
+        "position": payload.get("position") or "",
+        "services": payload.get("services") or [],
+        "submission_id": folder.rsplit("/", 1)[-1],
+        "saved_at": payload.get("saved_at") or "",
+        "refs": refs,
+        "files": files,
+        "kinds": kinds,
+    }
+
+
+def _parse_shard(raw: Optional[bytes]) -> Dict[str, Any]:
+    if raw is None:
+        return {"format": INDEX_FORMAT, "records": {}}
+    shard = json.loads(raw.decode("utf-8"))
+    if shard.get("format") != INDEX_FORMAT:
+        raise ValueError(f"지원하지 않는 색인 포맷: {shard.get('format')}")
+    return shard
+
+
+def _dump_shard(shard: Dict[str, Any]) -> bytes:
+    return json.dumps(shard, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _load_shard(path: str) -> Dict[str, Any]:
+    try:
+        return _parse_shard(storage.gh_get_raw(path))
+    except FileNotFoundError:
+        return _parse_shard(None)
+
+
+def index_submission(payload: Dict[str, Any], folder: str) -> Dict[str, Any]:
+    """제출 직후 호출 — 해당 월 조각에 이 제출본의 레코드를 넣거나 바꾼다.
+    같은 달에 동시에 제출해도 충돌 시 최신 조각에 다시 upsert하므로 서로의 레코드를 지우지 않는다."""
+    record = submission_record(payload, folder)
+
+    def _upsert(current: Optional[bytes]) -> bytes:
+        shard = _parse_shard(current)
+        shard["records"][record["key"]] = record
+        return _dump_shard(shard)
+
+    storage.gh_update(_shard_path(record["date"]), _upsert, message=f"[index] {record['user_name']} {record['date']}")
+    return record
+
+
+def load_records(max_workers: int = 4) -> List[Dict[str, Any]]:
+    shard_paths = [f["path"] for f in storage.gh_list_dir(index_dir()) or []
+                   if f.get("type") == "file" and f.get("name", "").endswith(".json")]
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        shards = list(ex.map(_load_shard, shard_paths))
+    return [r for shard in shards for r in shard["records"].values()]
+
+
+def rebuild_index(max_workers: int = 4) -> int:
+    """기존 제출본 전체(draft 제외)를 읽어 월별 조각을 새로 쓴다. 색인한 제출본 수를 반환."""
+    base = storage.base_dir()
+    days = [d["path"] for d in storage.gh_list_dir(base) or [] if d.get("type") == "dir" and d["name"] != INDEX_DIR_NAME]
+    json_paths = [
+        f["path"] for day_dir in days for f in storage.gh_walk_files(day_dir, max_workers=max_workers)
+        if f.get("name") == "submission.json" and "/draft/" not in f["path"]
+    ]
+
+    def _load(path: str):
+        try:
+            return json.loads(storage.gh_get_raw(path).decode("utf-8"))
+        except Exception:
+            return None
+
+    shards: Dict[str, Dict[str, Any]] = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        loaded = list(ex.map(_load, json_paths))
+    count = 0
+    for path, payload in zip(json_paths, loaded):
+        if not payload:
+            continue
+        record = submission_record(payload, path.rsplit("/", 1)[0])
+        shard = shards.setdefault(_shard_path(record["date"]), {"format": INDEX_FORMAT, "records": {}})
+        shard["records"][record["key"]] = record
+        count += 1
+    for path, shard in shards.items():
+        storage.gh_put_bytes(path, _dump_shard(shard), message="[index] rebuild")
+    return count
+
+
+def build_lookup(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """검색용 조회표: 책/장, 작성자, 예배, 파일 sha1 → 레코드 번호 집합."""
+    lookup = {"records": records, "by_chapter": {}, "by_book": {}, "by_user": {}, "by_service": {}, "by_sha1": {}}
+    for i, r in enumerate(records):
+        for code, chap, _, _ in r["refs"]:
+            lookup["by_chapter"].setdefault((code, chap), set()).add(i)
+            lookup["by_book"].setdefault(code, set()).add(i)
+        lookup["by_user"].setdefault(r["user_name"], set()).add(i)
+        for svc in r["services"]:
+            lookup["by_service"].setdefault(svc, set()).add(i)
+        for f in r["files"]:
+            if f.get("sha1"):
+                lookup["by_sha1"].setdefault(f["sha1"], set()).add(i)
+    return lookup
+
+
+def _overlaps(ref: List[Any], v_from: Optional[int], v_to: Optional[int]) -> bool:
+    if v_from is None or ref[2] is None:
+        return True
+    return ref[2] <= (v_to or v_from) and v_from <= (ref[3] or ref[2])
+
+
+def search(lookup: Dict[str, Any], reference: str = "", user_name: str = "", service: str = "",
+           date_from: Optional[date] = None, date_to: Optional[date] = None,
+           file_query: str = "", kind: str = "") -> List[Dict[str, Any]]:
+    """조건을 모두 만족하는 레코드를 최신 날짜순으로 반환. 빈 조건은 무시한다."""
+    records = lookup["records"]
+    candidates = set(range(len(records)))
+
+    ref = bible.parse_reference(reference) if reference.strip() else None
+    if reference.strip() and ref is None:
+        return []
+    if ref:
+        code, chap, v_from, v_to = ref
+        candidates &= lookup["by_chapter"].get((code, chap), set())
+        candidates = {i for i in candidates
+                      if any(r[0] == code and r[1] == chap and _overlaps(r, v_from, v_to) for r in records[i]["refs"])}
+    if user_name:
+        candidates &= lookup["by_user"].get(user_name, set())
+    if service:
+        candidates &= lookup["by_service"].get(service, set())
+    if file_query.strip():
+        q = file_query.strip().lower()
+        by_hash = set().union(*(ids for sha1, ids in lookup["by_sha1"].items() if sha1.startswith(q))) if len(q) >= 6 else set()
+        by_name = {i for i in candidates if any(q in (f.get("name") or "").lower() for f in records[i]["files"])}
+        candidates &= by_hash | by_name
+    if kind:
+        candidates = {i for i in candidates if kind in records[i]["kinds"]}
+    if date_from:
+        candidates = {i for i in candidates if records[i]["date"] >= date_from.isoformat()}
+    if date_to:
+        candidates = {i for i in candidates if records[i]["date"] <= date_to.isoformat()}
+    return sorted((records[i] for i in candidates), key=lambda r: (r["date"], r["saved_at"]), reverse=True)
+
+
+def format_ref(ref: List[Any]) -> str:
+    code, chap, v_from, v_to = ref
+    name = bible.book_name_of(code)
+    if v_from is None:
+        return f"{name} {chap}"
+    return f"{name} {chap}:{v_from}" + (f"-{v_to}" if v_to and v_to != v_from else "")
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""
+프로젝터 슬라이드(PNG) 렌더링
+- '성경 구절' 자료: 고정 해상도 슬라이드에 줄바꿈/페이지 나눔하여 렌더링
+- '이미지' 자료: 검은 배경에 비율 유지로 맞춰 렌더링
+- 페이지 나눔은 부모 프로세스에서(글리프 폭 캐시 사용), 실제 그리기는 프로세스 풀에서 수행
+- Streamlit 없이 import 가능 (프로세스 풀 워커가 이 모듈을 다시 import 함)
+  · 풀은 forkserver(없으면 spawn)로 띄움 — 스레드가 도는 Streamlit 서버 프로세스를 fork하면 교착될 수 있음
+- Pillow는 렌더링할 때 처음 import
+- 한글 글꼴이 꼭 필요함 (Pillow 기본 글꼴에는 한글 글리프가 없어 모든 글자가 같은 네모로 찍힘)
+  · Debian/Ubuntu·Streamlit Cloud: apt 패키지 fonts-nanum (저장소의 packages.txt)
+  · 그 밖의 환경: SLIDE_FONT_PATH 설정으로 한글 TTF/TTC 경로 지정
+"""
+
+import importlib.util, io, multiprocessing, os, re, zipfile
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
+
+from .materials import fetch_material_images, material_image_bytes
+
+SLIDE_SIZE = (1920, 1080)
+SLIDE_MARGIN = 110
+TITLE_SIZE = 52
+BODY_SIZE = 64
+LINE_SPACING = 1.5
+BG_COLOR = (0, 0, 0)
+TITLE_COLOR = (255, 214, 102)
+BODY_COLOR = (255, 255, 255)
+
+# 한글 글리프가 있는 폰트 후보 (앞에서부터 존재하는 것 사용)
+FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Bold.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgunbd.ttf",
+    "C:/Windows/Fonts/malgun.ttf",
+]
+
+NO_HANGUL_FONT_MSG = ("한글 글꼴을 찾을 수 없어 성경 구절 슬라이드를 만들 수 없습니다. "
+                      "서버에 fonts-nanum을 설치하거나(Streamlit Cloud: packages.txt) "
+                      "SLIDE_FONT_PATH에 한글 TTF/TTC 경로를 지정해 주세요.")
+
+_VERSE_LINE = re.compile(r"^(?P<book>\S+)\s+(?P<chap>\d+):(?P<verse>\d+)\s+(?P<text>.*)$")
+_MARKUP = re.compile(r"\*\*(.*?)\*\*|==(.*?)==")
+
+
+def pil_available() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+def _require_pil():
+    if not pil_available():
+        raise RuntimeError("Pillow가 설치되지 않았습니다. 'pip install pillow' 실행 후 다시 시도해주세요.")
+
+
+@lru_cache(maxsize=32)
+def font_has_hangul(font_path: str) -> bool:
+    """글꼴에 한글 글리프가 있는지 — 없는 글꼴은 '가'와 '힣'을 같은 대체 글리프로 그린다."""
+    _require_pil()
+    from PIL import ImageFont
+    try:
+        font = ImageFont.truetype(font_path, 32)
+    except OSError:
+        return False
+    return bytes(font.getmask("가")) != bytes(font.getmask("힣"))
+
+
+def resolve_font_path(preferred: Optional[str] = None, check_glyphs: bool = True) -> Optional[str]:
+    """preferred → FONT_CANDIDATES 순으로 존재하는(check_glyphs면 한글 글리프도 있는) 첫 글꼴 경로."""
+    for path in ([preferred] if preferred else []) + FONT_CANDIDATES:
+        if path and os.path.exists(path) and (not check_glyphs or font_has_hangul(path)):
+            return path
+    return None
+
+
+@lru_cache(maxsize=16)
+def _font(font_path: str, size: int):
+    _require_pil()
+    from PIL import ImageFont
+    return ImageFont.truetype(font_path, size)
+
+
+@lru_cache(maxsize=65536)
+def _char_width(font_path: Optional[str], size: int, ch: str) -> float:
+    return _font(font_path, size).getlength(ch)
+
+
+def _text_width(font_path: Optional[str], size: int, text: str) -> float:
+    return sum(_char_width(font_path, size, ch) for ch in text)
+
+
+@lru_cache(maxsize=4096)
+def wrap_text(text: str, font_path: Optional[str], size: int, max_width: int) -> Tuple[str, ...]:
+    """공백 단위로 줄을 나누고, 한 어절이 한 줄보다 길면 글자 단위로 자른다."""
+    lines: List[str] = []
+    cur = ""
+    for word in text.split():
+        cand = f"{cur} {word}" if cur else word
+        if _text_width(font_path, size, cand) <= max_width:
+            cur = cand
+            continue
+        if cur:
+            lines.append(cur)
+            cur = ""
+        # 어절 자체가 너무 길면 글자 단위로 분할 (한글은 어느 글자 사이에서 끊어도 자연스러움)
+        for ch in word:
+            if cur and _text_width(font_path, size, cur + ch) > max_width:
+                lines.append(cur)
+                cur = ""
+            cur += ch
+    if cur:
+        lines.append(cur)
+    return tuple(lines)
+
+
+def strip_markup(text: str) -> str:
+    return _MARKUP.sub(lambda m: m.group(1) if m.group(1) is not None else m.group(2), text or "")
+
+
+def _body_capacity() -> Tuple[int, int]:
+    line_h = int(BODY_SIZE * LINE_SPACING)
+    title_h = int(TITLE_SIZE * LINE_SPACING) * 2
+    usable = SLIDE_SIZE[1] - 2 * SLIDE_MARGIN - title_h
+    return max(1, usable // line_h), SLIDE_SIZE[0] - 2 * SLIDE_MARGIN
+
+
+def _range_title(refs: List[Tuple[str, str, str]]) -> str:
+    if not refs:
+        return ""
+    book, chap, first = refs[0]
+    _, last_chap, last = refs[-1]
+    if last_chap != chap:
+        return f"{book} {chap}:{first}-{last_chap}:{last}"
+    return f"{book} {chap}:{first}" + (f"-{last}" if last != first else "")
+
+
+def paginate_verses(verse_text: str, font_path: Optional[str]) -> List[Dict[str, Any]]:
+    """'성경 구절' 본문을 슬라이드 단위 페이지로 나눈다. 각 페이지는 {"title", "lines"}."""
+    max_lines, max_width = _body_capacity()
+    pages: List[Dict[str, Any]] = []
+    lines: List[str] = []
+    refs: List[Tuple[str, str, str]] = []
+
+    def _flush():
+        if lines:
+            pages.append({"title": _range_title(refs), "lines": list(lines)})
+        lines.clear()
+        refs.clear()
+
+    for raw in (verse_text or "").splitlines():
+        raw = strip_markup(raw).strip()
+        if not raw:
+            continue
+        m = _VERSE_LINE.match(raw)
+        if m:
+            ref = (m.group("book"), m.group("chap"), m.group("verse"))
+            body = f"{m.group('verse')} {m.group('text')}"
+        else:
+            ref, body = None, raw
+        wrapped = wrap_text(body, font_path, BODY_SIZE, max_width)
+        # 절이 현재 페이지에 다 들어가지 않으면 새 페이지에서 시작 (한 페이지보다 긴 절은 이어서 분할)
+        if lines and len(lines) + len(wrapped) > max_lines:
+            _flush()
+        for line in wrapped:
+            if len(lines) >= max_lines:
+                _flush()
+            if ref and ref not in refs:
+                refs.append(ref)
+            lines.append(line)
+    _flush()
+    return pages
+
+
+def _png_bytes(img) -> bytes:
+    out = io.BytesIO()
+    img.save(out, format="PNG", optimize=False)
+    return out.getvalue()
+
+
+def render_text_slide(job: Dict[str, Any]) -> bytes:
+    _require_pil()
+    from PIL import Image, ImageDraw
+    font_path = job.get("font_path")
+    img = Image.new("RGB", SLIDE_SIZE, BG_COLOR)
+    draw = ImageDraw.Draw(img)
+    y = SLIDE_MARGIN
+    if job.get("title"):
+        draw.text((SLIDE_MARGIN, y), job["title"], font=_font(font_path, TITLE_SIZE), fill=TITLE_COLOR)
+    y += int(TITLE_SIZE * LINE_SPACING) * 2
+    body_font = _font(font_path, BODY_SIZE)
+    line_h = int(BODY_SIZE * LINE_SPACING)
+    for line in job.get("lines", []):
+        draw.text((SLIDE_MARGIN, y), line, font=body_font, fill=BODY_COLOR)
+        y += line_h
+    return _png_bytes(img)
+
+
+def render_image_slide(job: Dict[str, Any]) -> bytes:
+    _require_pil()
+    from PIL import Image
+    with Image.open(io.BytesIO(job["image"])) as src:
+        src.draft("RGB", SLIDE_SIZE)  # JPEG는 디코딩 단계에서 축소해 메모리/시간 절약
+        src = src.convert("RGB")
+        src.thumbnail(SLIDE_SIZE, Image.LANCZOS)
+        img = Image.new("RGB", SLIDE_SIZE, BG_COLOR)
+        img.paste(src, ((SLIDE_SIZE[0] - src.width) // 2, (SLIDE_SIZE[1] - src.height) // 2))
+    return _png_bytes(img)
+
+
+def render_slide(job: Dict[str, Any]) -> bytes:
+    if job["type"] == "image":
+        return render_image_slide(job)
+    return render_text_slide(job)
+
+
+def _warm_worker(font_path: Optional[str]):
+    # 워커마다 폰트를 한 번만 로드해 두고 이후 작업에서 재사용
+    if font_path and pil_available():
+        _font(font_path, TITLE_SIZE)
+        _font(font_path, BODY_SIZE)
+
+
+def build_slide_jobs(materials: List[Dict[str, Any]], image_loader, font_path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """자료 목록을 순서대로 슬라이드 작업 목록으로 변환. image_loader(f)는 파일 항목의 바이트(또는 None)를 반환."""
+    font_path = resolve_font_path(font_path)
+    jobs: List[Dict[str, Any]] = []
+    for item in materials:
+        kind = item.get("kind")
+        if kind == "성경 구절":
+            if not font_path and (item.get("verse_text") or "").strip():
+                raise RuntimeError(NO_HANGUL_FONT_MSG)
+            for page in paginate_verses(item.get("verse_text", ""), font_path):
+                jobs.append({"type": "text", "font_path": font_path, **page})
+        elif kind == "이미지":
+            for f in item.get("files") or []:
+                data = image_loader(f)
+                if data:
+                    jobs.append({"type": "image", "image": data})
+    return jobs
+
+
+def render_slides(jobs: List[Dict[str, Any]], max_workers: Optional[int] = None) -> List[bytes]:
+    """슬라이드 작업을 프로세스 풀에서 렌더링해 PNG 바이트 목록을 작업 순서대로 반환."""
+    _require_pil()
+    from concurrent.futures import ProcessPoolExecutor
+    if len(jobs) <= 2:
+        return [render_slide(j) for j in jobs]
+    font_path = next((j.get("font_path") for j in jobs if j["type"] == "text"), None)
+    workers = max_workers or min(len(jobs), os.cpu_count() or 1)
+    start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method),
+                             initializer=_warm_worker, initargs=(font_path,)) as ex:
+        return list(ex.map(render_slide, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def build_slides_zip(materials: List[Dict[str, Any]], font_path: Optional[str] = None) -> bytes:
+    """자료 목록 전체를 슬라이드 PNG로 렌더링해 slide_001.png ... 로 묶은 ZIP 바이트를 반환."""
+    image_cache = fetch_material_images(materials)
+
+    def _load(f):
+        try:
+            return material_image_bytes(f, image_cache)
+        except Exception:
+            return None
+
+    pngs = render_slides(build_slide_jobs(materials, _load, font_path=font_path))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_STORED) as zf:
+        for i, png in enumerate(pngs, start=1):
+            zf.writestr(f"slide_{i:03d}.png", png)
+    return buffer.getvalue()
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+GitHub contents API 저장소
+- 설정(GITHUB_TOKEN/OWNER/REPO/BRANCH/BASE_DIR/API_URL 등)은 configure()로 넘긴 매핑 → 환경 변수 순으로 찾음
+- Streamlit 앱은 st.secrets를 그대로 configure()에 넘기고, 배치 작업은 환경 변수만으로 사용 가능
+- requests는 실제 요청 시점에 import
+- 큰 파일은 gh_put_stream으로 파일에서 조금씩 읽어 base64 본문을 흘려보냄 (파일 크기와 무관한 메모리)
+- 쓰기는 원격 파일의 기대 sha를 함께 보내는 낙관적 동시성 방식
+  · 그 사이 다른 쓰기가 끼어들면 GitHub가 409(또는 sha 누락 422)로 거절 → GitHubConflict
+  · gh_update()는 최신 내용을 다시 읽어 update 함수를 다시 적용하고 재시도 (전역 잠금 없음)
+"""
+
+import base64, io, json, os, random, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Mapping, Optional, Tuple
+
+WRITE_RETRIES = 6
+
+_settings: Optional[Mapping[str, Any]] = None
+
+
+def configure(settings: Optional[Mapping[str, Any]]):
+    global _settings
+    _settings = settings
+
+
+def setting(key: str, default: Any = None) -> Any:
+    if _settings is not None:
+        try:
+            value = _settings.get(key)
+        except Exception:  # st.secrets는 secrets.toml이 없으면 예외를 던짐
+            value = None
+        if value is not None:
+            return value
+    return os.environ.get(key, default)
+
+
+def base_dir() -> str:
+    return setting("GITHUB_BASE_DIR", "worship_submissions")
+
+
+def _require(key: str) -> str:
+    value = setting(key)
+    if not value:
+        raise RuntimeError(f"{key} 설정이 없습니다. (secrets.toml 또는 환경 변수)")
+    return value
+
+
+def _gh_headers():
+    return {
+        "Authorization": f"token {_require('GITHUB_TOKEN')}",
+        "Accept": "application/vnd.github+json",
+    }
+
+
+def _gh_api_base():
+    owner = _require("GITHUB_OWNER")
+    repo = _require("GITHUB_REPO")
+    api_url = setting("GITHUB_API_URL", "https://api.github.com").rstrip("/")  # 부하 테스트 시 로컬 대역 서버
+    return f"{api_url}/repos/{owner}/{repo}"
+
+
+class GitHubConflict(RuntimeError):
+    """기대한 sha와 원격 파일의 현재 sha가 달라 쓰기가 거절됨."""
+
+
+_LOOKUP = object()
+
+
+def _is_conflict(r) -> bool:
+    # 오래된 sha → 409, 이미 있는 파일에 sha 없이 쓰기 → 422 "sha wasn't supplied"
+    return r.status_code == 409 or (r.status_code == 422 and "sha" in r.text)
+
+
+def _check_put(r, path: str):
+    if _is_conflict(r):
+        raise GitHubConflict(f"GitHub 쓰기 충돌: {path}")
+    if r.status_code not in (200, 201):
+        raise RuntimeError(f"GitHub 업로드 실패: {r.status_code} {r.text}")
+    return r.json()
+
+
+def _backoff(attempt: int):
+    time.sleep(random.uniform(0, 0.1 * (2 ** attempt)))
+
+
+def gh_get_sha(path: str) -> Optional[str]:
+    import requests
+    r = requests.get(f"{_gh_api_base()}/contents/{path}", headers=_gh_headers())
+    return r.json().get("sha") if r.status_code == 200 else None
+
+
+def gh_get_with_sha(path: str) -> Tuple[Optional[bytes], Optional[str]]:
+    """(내용, sha). 파일이 없으면 (None, None)."""
+    import requests
+    r = requests.get(f"{_gh_api_base()}/contents/{path}", headers=_gh_headers())
+    if r.status_code != 200:
+        return None, None
+    j = r.json()
+    if j.get("encoding") == "base64" and j.get("content"):
+        return base64.b64decode(j["content"]), j.get("sha")
+    # 1MB 초과 파일은 content가 비어 있음 → raw로 받음 (더 새 내용이면 sha 불일치로 다음 쓰기가 재시도됨)
+    return gh_get_raw(path), j.get("sha")
+
+
+def _put_contents(path: str, content_bytes: bytes, message: str, sha: Optional[str]):
+    import requests
+    payload = {
+        "message": message,
+        "content": base64.b64encode(content_bytes).decode("utf-8"),
+        "branch": setting("GITHUB_BRANCH", "main"),
+    }
+    if sha:
+        payload["sha"] = sha
+    r = requests.put(f"{_gh_api_base()}/contents/{path}", headers=_gh_headers(), json=payload)
+    return _check_put(r, path)
+
+
+def gh_put_bytes(path: str, content_bytes: bytes, message: str, expected_sha: Any = _LOOKUP):
+    """path에 content_bytes를 쓴다.
+
+    expected_sha를 주면 그 sha(None이면 '아직 없는 파일')일 때만 쓰고, 다르면 GitHubConflict.
+    생략하면 덮어쓰기 — 현재 sha를 조회해 쓰고, 그 사이 다른 쓰기가 끼어들면 sha를 다시 조회해 재시도.
+    """
+    if expected_sha is not _LOOKUP:
+        return _put_contents(path, content_bytes, message, expected_sha)
+    for attempt in range(WRITE_RETRIES):
+        try:
+            return _put_contents(path, content_bytes, message, gh_get_sha(path))
+        except GitHubConflict:
+            if attempt == WRITE_RETRIES - 1:
+                raise
+            _backoff(attempt)
+
+
+def gh_update(path: str, update: Callable[[Optional[bytes]], Optional[bytes]], message: str,
+              retries: int = WRITE_RETRIES) -> Optional[bytes]:
+    """읽기 → update(현재 내용 또는 None) → 기대 sha로 쓰기. 충돌하면 최신 내용으로 다시 반복.
+
+    update는 여러 번 호출될 수 있으므로 부작용 없이 새 내용을 돌려줘야 한다 (None이면 쓰지 않음).
+    실제로 기록된 내용을 반환.
+    """
+    for attempt in range(retries):
+        current, sha = gh_get_with_sha(path)
+        new = update(current)
+        if new is None:
+            return current
+        try:
+            _put_contents(path, new, message, sha)
+            return new
+        except GitHubConflict:
+            if attempt == retries - 1:
+                raise
+            _backoff(attempt)
+
+
+class _Base64JsonBody:
+    """{..., "content": "<base64>"} JSON 요청 본문을 fileobj에서 조각씩 읽어 만들어 내는 iterable.
+
+    __len__으로 정확한 Content-Length를 알려 주므로 chunked 전송 없이 보낼 수 있고,
+    반복할 때마다 시작 위치로 되돌아가므로 재시도에도 쓸 수 있다.
+    """
+    PIECE = 3 * 64 * 1024  # 3의 배수여야 조각별 base64를 그대로 이어 붙일 수 있음
+
+    def __init__(self, fields: Dict[str, Any], fileobj, length: int, start: Optional[int] = None):
+        head = json.dumps(fields, ensure_ascii=False)
+        self.prefix = (head[:-1] + (", " if fields else "") + '"content": "').encode("utf-8")
+        self.suffix = b'"}'
+        self.fileobj = fileobj
+        self.start = fileobj.tell() if start is None else start
+        self.length = length
+
+    def __len__(self):
+        return len(self.prefix) + 4 * ((self.length + 2) // 3) + len(self.suffix)
+
+    def __iter__(self):
+        self.fileobj.seek(self.start)
+        yield self.prefix
+        remaining = self.length
+        while remaining > 0:
+            piece = self.fileobj.read(min(self.PIECE, remaining))
+            if not piece:
+                raise IOError("업로드 중 파일이 예상보다 짧습니다.")
+            remaining -= len(piece)
+            yield base64.b64encode(piece)
+        yield self.suffix
+
+
+def gh_put_stream(path: str, fileobj, length: int, message: str, skip_existing: bool = False):
+    """fileobj의 현재 위치부터 length 바이트를 path에 업로드. 본문 전체를 메모리에 만들지 않는다."""
+    import requests
+    url = f"{_gh_api_base()}/contents/{path}"
+    start = fileobj.tell()
+    for attempt in range(WRITE_RETRIES):
+        sha = gh_get_sha(path)
+        if sha and skip_existing:
+            return {"content": {"path": path, "sha": sha}}
+        fields = {"message": message, "branch": setting("GITHUB_BRANCH", "main")}
+        if sha:
+            fields["sha"] = sha
+        headers = {**_gh_headers(), "Content-Type": "application/json"}
+        try:
+            body = _Base64JsonBody(fields, fileobj, length, start=start)
+            return _check_put(requests.put(url, headers=headers, data=body), path)
+        except GitHubConflict:
+            if attempt == WRITE_RETRIES - 1:
+                raise
+            _backoff(attempt)
+
+
+def gh_get_bytes(path: str) -> bytes:
+    import requests
+    api = _gh_api_base()
+    url = f"{api}/contents/{path}"
+    r = requests.get(url, headers=_gh_headers())
+    if r.status_code != 200:
+        raise FileNotFoundError(f"GitHub 파일 없음: {path}")
+    content = r.json()["content"]
+    return base64.b64decode(content)
+
+
+def gh_list_dir(path: str):
+    import requests
+    api = _gh_api_base()
+    url = f"{api}/contents/{path}"
+    r = requests.get(url, headers=_gh_headers())
+    if r.status_code != 200:
+        return []
+    return r.json()
+
+
+def gh_stream_to(path: str, fileobj, chunk_size: int = 64 * 1024) -> int:
+    # raw 미디어 타입으로 받아 청크 단위로 fileobj에 기록 (base64 JSON 전체를 메모리에 올리지 않음)
+    import requests
+    api = _gh_api_base()
+    url = f"{api}/contents/{path}"
+    headers = {**_gh_headers(), "Accept": "application/vnd.github.raw"}
+    written = 0
+    with requests.get(url, headers=headers, stream=True) as r:
+        if r.status_code != 200:
+            raise FileNotFoundError(f"GitHub 파일 없음: {path}")
+        for chunk in r.iter_content(chunk_size=chunk_size):
+            if chunk:
+                fileobj.write(chunk)
+                written += len(chunk)
+    return written
+
+
+def gh_get_raw(path: str) -> bytes:
+    # contents API의 base64 content는 1MB 초과 파일에서 비어 있으므로 raw로 받는다
+    buf = io.BytesIO()
+    gh_stream_to(path, buf)
+    return buf.getvalue()
+
+
+def gh_walk_files(path: str, max_workers: int = 4) -> List[Dict[str, Any]]:
+    # 디렉터리 트리를 레벨 단위로 동시에 조회해 파일 항목만 모아 반환
+    files: List[Dict[str, Any]] = []
+    level = [path]
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        while level:
+            next_level = []
+            for items in ex.map(gh_list_dir, level):
+                for it in items or []:
+                    if it.get("type") == "dir":
+                        next_level.append(it["path"])
+                    elif it.get("type") == "file":
+                        files.append(it)
+            level = next_level
+    return files
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+저장소(GitHub) 동시 사용 부하 테스트 — 앱 인스턴스 N개가 같은 저장소를 동시에 쓸 때
+- ※ 앱 서버 한 대(streamlit run 프로세스 하나)가 세션을 몇 개까지 감당하는지는 측정하지 않는다
+  · 세션마다 별도 프로세스에서 AppTest를 돌리므로 세션마다 자기 Streamlit 런타임/st.cache_data/GIL을 갖고
+    여러 코어에 흩어져 실행됨 (AppTest는 실행마다 프로세스 전역 런타임을 켰다 끄므로 한 프로세스에서 동시에 못 돌림)
+  · 따라서 처리량·지연은 서버 한 대의 수용량보다 낙관적인 값이고, 메모리는 세션 프로세스별 RSS 증가
+  · 측정 대상: 동시 저장/제출 시 sha 충돌·재시도, 요청 한도, 대역 서버 요청 수, 흐름별 지연
+- 별도 프로세스로 ch2.fake_github를 띄우고(지연/요청 한도 주입) 세션 N개를 동시에 시작
+- 교역자 세션: 입장 → 자료 추가(성경 구절) → 자료 추가(설교 전문) → 임시 저장 → 제출
+- 미디어부 세션: 입장 → 제출함 새로고침(rounds회) → 지난 제출 검색
+  (AppTest는 file_uploader를 조작할 수 없어 첨부 파일 업로드는 포함하지 않음)
+- 보고: 동작별 횟수/오류/p50/p99/최대 지연, 전체 처리량(동작/초), 세션 프로세스별 메모리, 대역 서버 요청 통계
+  (세션 프로세스마다 streamlit을 따로 올리므로 세션 수만큼 메모리가 필요)
+
+사용법:
+    python -m ch2.storage_loadtest --pastors 8 --viewers 4 --latency-ms 80 --rate-per-s 30
+    python -m ch2.storage_loadtest --pastors 20 --viewers 20 --rounds 3 --tracemalloc
+"""
+
+import argparse, json, math, multiprocessing, os, resource, subprocess, sys, time, tracemalloc
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.request import urlopen
+
+ACCESS_CODE = "0001"
+Sample = Tuple[str, float, bool, str]  # (동작, 초, 성공 여부, 오류 메시지)
+
+
+# ---------------------------
+# 대역 서버
+# ---------------------------
+def start_fake_github(args) -> Tuple[subprocess.Popen, str]:
+    cmd = [sys.executable, "-m", "ch2.fake_github", "--port", "0",
+           "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms)]
+    if args.rate_per_s:
+        cmd += ["--rate-per-s", str(args.rate_per_s)]
+    for d in args.seed:
+        cmd += ["--seed", d]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline()
+    if "GITHUB_API_URL=" not in line:
+        proc.kill()
+        raise RuntimeError(f"대역 서버 시작 실패: {line!r}")
+    return proc, line.split("GITHUB_API_URL=", 1)[1].split()[0]
+
+
+def fake_github_stats(api_url: str) -> Dict[str, int]:
+    with urlopen(f"{api_url}/_stats") as r:
+        return json.loads(r.read().decode("utf-8"))
+
+
+# ---------------------------
+# 세션 시나리오
+# ---------------------------
+class Session:
+    def __init__(self, app_path: str, name: str, timeout: float):
+        from streamlit.testing.v1 import AppTest
+        self.at = AppTest.from_file(app_path, default_timeout=timeout)
+        self.name = name
+        self.samples: List[Sample] = []
+
+    def step(self, action: str, fn: Callable[[], None]):
+        t0 = time.perf_counter()
+        error = ""
+        try:
+            fn()
+            if self.at.exception:
+                error = str(self.at.exception[0].value)[:200]
+            elif self.at.error:
+                error = str(self.at.error[0].value)[:200]
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"[:200]
+        self.samples.append((action, time.perf_counter() - t0, not error, error))
+        if error:
+            raise RuntimeError(error)
+
+    def button(self, label: str):
+        return next(b for b in self.at.button if b.label == label)
+
+    def login(self, role: str):
+        self.step("open", self.at.run)
+
+        def _enter():
+            self.at.radio[0].set_value(role)
+            self.at.text_input[0].input(self.name)
+            self.at.text_input[1].input(ACCESS_CODE)
+            self.at.button[0].click().run()
+        self.step("login", _enter)
+
+
+def pastor_flow(s: Session, rounds: int):
+    s.login("교역자")
+    for r in range(rounds):
+        s.step("add_material", lambda: s.button("+ 자료 추가").click().run())
+        s.step("add_material", lambda: (
+            s.at.text_area(key=f"verse_{s.at.session_state.materials[-1]['id']}").input(f"요한복음 3:16 — {s.name} #{r}"),
+            s.button("+ 자료 추가").click().run()))
+        mid = s.at.session_state.materials[-1]["id"]
+        s.step("edit_material", lambda: s.at.selectbox(key=f"kind_{mid}").set_value("설교 전문").run())
+        s.step("draft", lambda: (
+            s.at.text_area(key=f"full_{mid}").input(f"{s.name}의 설교 전문 {r}\n**굵게** ==형광펜=="),
+            s.button("💾 임시 저장").click().run()))
+        s.step("submit", lambda: s.button("✅ 제출").click().run())
+
+
+def viewer_flow(s: Session, rounds: int):
+    s.login("미디어부")
+    for _ in range(rounds):
+        s.step("inbox", s.at.run)
+    s.step("search", lambda: (s.at.text_input(key="q_ref").input("요 3:16"), s.button("검색").click().run()))
+
+
+FLOWS = {"pastor": pastor_flow, "viewer": viewer_flow}
+
+
+def run_session(flow_name: str, name: str, app_path: str, rounds: int, timeout: float, trace_heap: bool,
+                start, results):
+    """세션 프로세스 본체: 준비 → 모두 준비될 때까지 대기(start) → 시나리오 실행 → (samples, 메모리) 전달."""
+    s = None
+    samples: List[Sample] = []
+    try:
+        # 워밍업 실행 하나로 streamlit/앱 모듈을 먼저 올려 두고 그 뒤부터 측정
+        Session(app_path, "warmup", timeout).at.run()
+        s = Session(app_path, name, timeout)
+    except Exception as e:
+        samples.append(("open", 0.0, False, f"{type(e).__name__}: {e}"[:200]))
+    start.wait()
+    rss0 = maxrss_kb()
+    if trace_heap:
+        tracemalloc.start()
+        heap0 = tracemalloc.get_traced_memory()[0]
+    if s is not None:
+        try:
+            FLOWS[flow_name](s, rounds)
+        except Exception:
+            pass  # 실패한 동작은 samples에 기록됨 — 그 세션의 나머지 동작은 건너뜀
+        samples = s.samples
+    mem = {"rss_kb": maxrss_kb() - rss0}
+    if trace_heap:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        mem["retained"], mem["peak"] = current - heap0, peak - heap0
+    results.put((samples, mem))
+
+
+# ---------------------------
+# 집계
+# ---------------------------
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(p * len(ordered)) - 1))] if ordered else float("nan")
+
+
+def maxrss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # Linux: KB
+
+
+def report(samples: List[Sample], wall: float, n_sessions: int, mem: Dict[str, float], server: Dict[str, int]):
+    by_action: Dict[str, List[Sample]] = {}
+    for smp in samples:
+        by_action.setdefault(smp[0], []).append(smp)
+    print(f"{'동작':<14}{'횟수':>6}{'오류':>6}{'p50 ms':>10}{'p99 ms':>10}{'최대 ms':>10}")
+    for action, rows in by_action.items():
+        ok = [t for _, t, good, _ in rows if good]
+        print(f"{action:<14}{len(rows):>6}{len(rows) - len(ok):>6}"
+              f"{percentile(ok, 0.5) * 1000:>10.1f}{percentile(ok, 0.99) * 1000:>10.1f}{max(ok, default=float('nan')) * 1000:>10.1f}")
+    n_ok = sum(1 for smp in samples if smp[2])
+    print(f"세션 {n_sessions}개(각각 별도 앱 인스턴스), {wall:.1f}초 — 처리량 {n_ok / wall:.2f} 동작/초 (성공 {n_ok}/{len(samples)})")
+    print("  ※ 앱 서버 한 대의 수용량이 아님 — 세션마다 별도 프로세스라 런타임/캐시/GIL을 나눠 쓰지 않음")
+    print(f"메모리: 세션 프로세스별 최대 RSS 증가 합 {mem['rss_kb'] / 1024:.1f} MB → 프로세스당 {mem['rss_kb'] / 1024 / n_sessions:.2f} MB")
+    if "retained" in mem:
+        print(f"        파이썬 힙 유지 {mem['retained'] / 1024:.0f} KB/프로세스, 최대 {mem['peak'] / 1024:.0f} KB/프로세스")
+    print(f"대역 서버: GET {server.get('GET')} · PUT {server.get('PUT')} · "
+          f"한도 초과 {server.get('rate_limited')} · 충돌 {server.get('conflicts')}")
+    errors = sorted({e for _, _, good, e in samples if not good})
+    for e in errors[:5]:
+        print(f"  오류 예: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="저장소 동시 사용 부하 테스트 — 세션마다 별도 앱 인스턴스 "
+                                             "(앱 서버 한 대의 수용량은 측정하지 않음, 로컬 GitHub 대역 서버)")
+    ap.add_argument("--app", default="ch_test.py")
+    ap.add_argument("--pastors", type=int, default=4, help="교역자 세션 수")
+    ap.add_argument("--viewers", type=int, default=2, help="미디어부 세션 수")
+    ap.add_argument("--rounds", type=int, default=1, help="세션별 반복 횟수")
+    ap.add_argument("--latency-ms", type=float, default=50.0)
+    ap.add_argument("--jitter-ms", type=float, default=20.0)
+    ap.add_argument("--rate-per-s", type=float, default=None)
+    ap.add_argument("--seed", action="append", default=None, help="대역 서버에 미리 넣을 폴더 (기본: bsk_compact)")
+    ap.add_argument("--timeout", type=float, default=300.0, help="AppTest 한 번 실행의 제한 시간(초)")
+    ap.add_argument("--tracemalloc", action="store_true", help="세션당 파이썬 힙 사용량도 측정 (느려짐)")
+    args = ap.parse_args(argv)
+    args.seed = args.seed if args.seed is not None else ["bsk_compact"]
+
+    proc, api_url = start_fake_github(args)
+    try:
+        os.environ.update({
+            "GITHUB_API_URL": api_url, "GITHUB_TOKEN": "loadtest", "GITHUB_OWNER": "loadtest",
+            "GITHUB_REPO": "loadtest", "GITHUB_BASE_DIR": "loadtest_submissions",
+        })
+        app_path = os.path.abspath(args.app)
+        n = args.pastors + args.viewers
+        ctx = multiprocessing.get_context("spawn")  # 부모의 streamlit 상태를 물려받지 않는 깨끗한 프로세스
+        start = ctx.Barrier(n + 1)
+        results = ctx.Queue()
+        sessions = ([("pastor", f"목사{i:03d}") for i in range(args.pastors)]
+                    + [("viewer", f"미디어{i:03d}") for i in range(args.viewers)])
+        procs = [ctx.Process(target=run_session, args=(flow, name, app_path, args.rounds, args.timeout,
+                                                       args.tracemalloc, start, results))
+                 for flow, name in sessions]
+        for p in procs:
+            p.start()
+        start.wait()
+        t0 = time.perf_counter()
+        outputs = [results.get() for _ in procs]  # join 전에 비워야 큐에 막혀 끝나지 않는 일이 없음
+        wall = time.perf_counter() - t0
+        for p in procs:
+            p.join()
+
+        mems = [m for _, m in outputs]
+        mem = {"rss_kb": sum(m["rss_kb"] for m in mems)}
+        if args.tracemalloc:
+            mem["retained"] = sum(m["retained"] for m in mems) / n
+            mem["peak"] = sum(m["peak"] for m in mems) / n
+        report([smp for samples, _ in outputs for smp in samples], wall, n, mem, fake_github_stats(api_url))
+    finally:
+        proc.terminate()
+        proc.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
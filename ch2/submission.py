@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+제출(submission) 직렬화 + 저장 경로 + 날짜별 제출본 조회
+- 저장 구조: {GITHUB_BASE_DIR}/{YYYY-MM-DD}/{작성자}/{제출 ID 또는 draft}/submission.json|submission.docx|files/
+- submission.json 저장은 storage.gh_update로 충돌 시 재시도하며, 자료 목록은 자료 id 기준 3-way 병합
+  (base = 이 화면이 마지막으로 읽거나 쓴 원격 내용, ours = 지금 저장하려는 내용, theirs = 현재 원격 내용)
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timezone
+from typing import List, Dict, Any, Optional
+
+from . import storage
+
+BASE_SERVICES = ["1부", "2부", "3부", "오후예배"]
+
+
+def serialize_submission(worship_date: date, services: List[str], materials: List[Dict[str, Any]],
+                         user_name: Optional[str], position: Optional[str], role: Optional[str]) -> Dict[str, Any]:
+    return {
+        "worship_date": str(worship_date),
+        "services": services or [],
+        "materials": materials or [],
+        "user_name": user_name,
+        "position": position,
+        "role": role,
+        "saved_at": datetime.now(timezone.utc).isoformat()
+    }
+
+
+def gh_paths(user_name: str, worship_date: date, submission_id: str = None):
+    base = storage.base_dir()
+    d = worship_date.strftime("%Y-%m-%d")
+    safe_user = (user_name or "unknown").strip().replace("/", "_")
+    sub_id = "draft" if submission_id is None else submission_id
+    folder = f"{base}/{d}/{safe_user}/{sub_id}"
+    return {
+        "folder": folder,
+        "files_dir": f"{folder}/files",
+        "json": f"{folder}/submission.json",
+        "docx": f"{folder}/submission.docx",
+    }
+
+
+def merge_materials(base: Optional[List[Dict[str, Any]]], ours: List[Dict[str, Any]],
+                    theirs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """자료 id 기준 3-way 병합.
+    - 양쪽에서 바뀐 자료는 ours 우선, 한쪽만 바꿨으면 바뀐 쪽
+    - 한쪽이 지운 자료는 다른 쪽이 고치지 않았을 때만 지움
+    - theirs에만 새로 생긴 자료는 theirs에서의 앞 자료 뒤에 끼워 넣음
+    base가 None이면(처음 저장) 지운 자료가 없다고 보고 합집합.
+    """
+    base_by_id = {m.get("id"): m for m in base or []}
+    theirs_by_id = {m.get("id"): m for m in theirs}
+    ours_ids = {m.get("id") for m in ours}
+
+    merged = []
+    for m in ours:
+        mid = m.get("id")
+        if mid in theirs_by_id or mid not in base_by_id:
+            ours_changed = base_by_id.get(mid) != m
+            merged.append(m if ours_changed or mid not in theirs_by_id else theirs_by_id[mid])
+        elif m != base_by_id[mid]:
+            merged.append(m)  # theirs가 지웠지만 ours가 고침 → 남김
+    for i, m in enumerate(theirs):
+        mid = m.get("id")
+        if mid in ours_ids:
+            continue
+        if mid in base_by_id and m == base_by_id[mid]:
+            continue  # ours가 지웠고 theirs는 손대지 않음 → 지움
+        pos = 0
+        for prev in reversed(theirs[:i]):
+            idx = next((j for j, x in enumerate(merged) if x.get("id") == prev.get("id")), None)
+            if idx is not None:
+                pos = idx + 1
+                break
+        merged.insert(pos, m)
+    return merged
+
+
+def merge_payload(base: Optional[Dict[str, Any]], ours: Dict[str, Any],
+                  theirs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    if not theirs:
+        return ours
+    return {**ours, "materials": merge_materials(base.get("materials") if base else None,
+                                                 ours.get("materials") or [], theirs.get("materials") or [])}
+
+
+def write_submission_json(path: str, payload: Dict[str, Any], base: Optional[Dict[str, Any]],
+                          message: str) -> Dict[str, Any]:
+    """payload를 path에 저장. 그 사이 다른 저장이 있었다면 자료 목록을 병합해 저장하고, 저장된 payload를 반환."""
+    def _update(current: Optional[bytes]) -> bytes:
+        theirs = json.loads(current.decode("utf-8")) if current else None
+        if theirs == base:
+            theirs = None  # 내가 마지막으로 본 그대로 → 병합 필요 없음
+        return json.dumps(merge_payload(base, payload, theirs), ensure_ascii=False).encode("utf-8")
+
+    written = storage.gh_update(path, _update, message=message)
+    return json.loads(written.decode("utf-8"))
+
+
+def service_sort_key(service: str):
+    return (BASE_SERVICES.index(service) if service in BASE_SERVICES else len(BASE_SERVICES), service)
+
+
+def load_day_submissions(day_dir: str, max_workers: int = 4) -> List[Dict[str, Any]]:
+    """day_dir 아래 제출본(draft 제외)의 submission.json을 동시에 읽어 반환."""
+    json_paths = [
+        f["path"] for f in storage.gh_walk_files(day_dir, max_workers=max_workers)
+        if f.get("name") == "submission.json" and "/draft/" not in f["path"]
+    ]
+
+    def _load(path: str):
+        try:
+            return json.loads(storage.gh_get_raw(path).decode("utf-8"))
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        return [p for p in ex.map(_load, json_paths) if p]
+
+
+def group_submissions_by_service(payloads: List[Dict[str, Any]],
+                                 service: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """예배별로 묶어 제출 시각순으로 정렬. 같은 작성자의 제출본도 제출 ID가 다르면 서로 다른 제출이므로 모두 남긴다
+    (같은 화면에서 다시 제출하면 같은 ID의 제출본을 덮어쓴다)."""
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for payload in payloads:
+        for svc in payload.get("services") or ["(미지정)"]:
+            if service and svc != service:
+                continue
+            grouped.setdefault(svc, []).append(payload)
+    for svc in grouped:
+        grouped[svc].sort(key=lambda x: x.get("saved_at") or "")
+    return {svc: grouped[svc] for svc in sorted(grouped, key=service_sort_key)}
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+이미지 썸네일 생성
+- 긴 변 THUMB_MAX_SIDE 이하로 줄여 WebP(지원 안 되면 JPEG)로 인코딩 — 한 장에 수 KB
+- 저장/조회(파일 해시별로 한 번만 생성, 원본 옆 _thumbs/ 에 보관)는 ch2.materials 에서 담당
+- Pillow는 실제로 만들 때 처음 import
+"""
+
+import io
+from functools import lru_cache
+
+THUMB_MAX_SIDE = 320
+THUMB_QUALITY = 70
+
+
+@lru_cache(maxsize=1)
+def thumbnail_format() -> str:
+    from PIL import features
+    return "WEBP" if features.check("webp") else "JPEG"
+
+
+def thumbnail_ext() -> str:
+    return ".webp" if thumbnail_format() == "WEBP" else ".jpg"
+
+
+def make_thumbnail(src, max_side: int = THUMB_MAX_SIDE) -> bytes:
+    """src(바이트 또는 읽을 수 있는 파일 객체)의 썸네일 바이트. EXIF 회전을 반영한다."""
+    from PIL import Image, ImageOps
+    with Image.open(io.BytesIO(src) if isinstance(src, (bytes, bytearray)) else src) as im:
+        im.draft("RGB", (max_side, max_side))  # JPEG는 디코딩 단계에서 미리 축소
+        im = ImageOps.exif_transpose(im)
+        im.thumbnail((max_side, max_side))
+        fmt = thumbnail_format()
+        if fmt == "JPEG" or im.mode not in ("RGB", "RGBA"):
+            im = im.convert("RGBA" if fmt == "WEBP" and "A" in im.getbands() else "RGB")
+        buf = io.BytesIO()
+        if fmt == "WEBP":
+            im.save(buf, format=fmt, quality=THUMB_QUALITY, method=4)
+        else:
+            im.save(buf, format=fmt, quality=THUMB_QUALITY, optimize=True)
+        return buf.getvalue()
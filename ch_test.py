@@ -2,7 +2,8 @@
 """
 Streamlit 예배 자료 업로드 + Word 저장 + GitHub 임시저장/제출 (+ 성경 JSON 연동)
 - '성경 구절' 자료 유형 선택 시: 책/장/절 선택 후 본문 자동 입력
-- 성경 JSON은 GitHub 리포의 bsk_json/{book_code}_{chap:03d}.json 에서 로드
+- 성경 JSON은 GitHub 리포의 bsk_compact/{book_code}.json (없으면 bsk_json/{book_code}_{chap:03d}.json) 에서 로드
+- 성경/저장소/DOCX/제출 모델 로직은 ch2 패키지에 있고, 이 파일은 화면(UI)만 담당
 """
 
 # ---------------------------
@@ -14,26 +15,31 @@ st.set_page_config(page_title="설교 자료 업로드", page_icon="🙏", layou
 # ---------------------------
 # 표준/서드파티 import
 # ---------------------------
-import io, os, re, json, uuid, base64, tempfile, requests, hashlib, mimetypes, time
-from copy import deepcopy
+import os, json, uuid, tempfile
 from typing import List, Dict, Any, Optional
-from datetime import date, datetime, timezone
-from functools import lru_cache
-
-# python-docx / PIL
-try:
-    from docx import Document
-    from docx.shared import Inches, Pt
-    from docx.enum.text import WD_ALIGN_PARAGRAPH, WD_COLOR_INDEX
-except Exception:
+from datetime import date, datetime
+
+# 핵심 로직 (python-docx/Pillow/requests는 실제로 쓸 때 ch2 내부에서 import)
+from ch2 import bible, bible_compact, storage, materials as mat, submission, docx_render, slides, export, search_index, thumbnails
+from ch2.bible import BOOKS, CHAPTER_COUNT, get_book_code
+from ch2.submission import BASE_SERVICES, gh_paths
+from ch2.storage import gh_put_bytes, gh_get_bytes, gh_list_dir
+
+storage.configure(st.secrets)
+
+# python-docx / PIL (설치 여부만 확인하고 import는 하지 않음)
+DOCX_AVAILABLE = docx_render.docx_available()
+if not DOCX_AVAILABLE:
     st.warning("python-docx가 설치되지 않았습니다. 터미널에서: pip install python-docx")
-    Document = None
 
-try:
-    from PIL import Image
-except Exception:
+PIL_AVAILABLE = slides.pil_available()
+if not PIL_AVAILABLE:
     st.warning("Pillow가 설치되지 않았습니다. 터미널에서: pip install pillow")
-    Image = None
+
+SLIDE_FONT_PATH = storage.setting("SLIDE_FONT_PATH")
+# 파일 존재만 확인 (글리프 검사는 Pillow import가 필요해 실제 렌더링 때 수행)
+if PIL_AVAILABLE and slides.resolve_font_path(SLIDE_FONT_PATH, check_glyphs=False) is None:
+    st.warning(slides.NO_HANGUL_FONT_MSG)
 
 # ---------------------------
 # 스타일
@@ -71,48 +77,16 @@ if "can_edit" not in st.session_state:
     st.session_state.can_edit = False
 if "worship_date" not in st.session_state:
     st.session_state.worship_date = date.today()
+if "remote_bases" not in st.session_state:
+    st.session_state.remote_bases = {}  # 저장 경로 → 이 화면이 마지막으로 읽거나 쓴 원격 payload (병합 기준)
 if "submission_id" not in st.session_state:
     st.session_state.submission_id = None
 
-BASE_SERVICES = ["1부", "2부", "3부", "오후예배"]
 if "services_options" not in st.session_state:
     st.session_state.services_options = BASE_SERVICES.copy()
 if "services_selected" not in st.session_state:
     st.session_state.services_selected: List[str] = []
 
-# ---------------------------
-# 성경 JSON 설정 (GitHub 경로/코드/장수)
-# ---------------------------
-BIBLE_JSON_DIR = st.secrets.get("GITHUB_BIBLE_DIR", "bsk_json")
-
-BOOKS = {
-    # OT
-    "창세기":"gen","출애굽기":"exo","레위기":"lev","민수기":"num","신명기":"deu",
-    "여호수아":"jos","사사기":"jdg","룻기":"rut","사무엘상":"1sa","사무엘하":"2sa",
-    "열왕기상":"1ki","열왕기하":"2ki","역대상":"1ch","역대하":"2ch","에스라":"ezr",
-    "느헤미야":"neh","에스더":"est","욥기":"job","시편":"psa","잠언":"pro",
-    "전도서":"ecc","아가":"sng","이사야":"isa","예레미야":"jer","예레미야애가":"lam",
-    "에스겔":"ezk","다니엘":"dan","호세아":"hos","요엘":"jol","아모스":"amo",
-    "오바댜":"oba","요나":"jnh","미가":"mic","나훔":"nam","하박국":"hab",
-    "스바냐":"zep","학개":"hag","스가랴":"zec","말라기":"mal",
-    # NT
-    "마태복음":"mat","마가복음":"mrk","누가복음":"luk","요한복음":"jhn","사도행전":"act",
-    "로마서":"rom","고린도전서":"1co","고린도후서":"2co","갈라디아서":"gal","에베소서":"eph",
-    "빌립보서":"php","골로새서":"col","데살로니가전서":"1th","데살로니가후서":"2th","디모데전서":"1ti",
-    "디모데후서":"2ti","디도서":"tit","빌레몬서":"phm","히브리서":"heb","야고보서":"jas",
-    "베드로전서":"1pe","베드로후서":"2pe","요한1서":"1jn","요한2서":"2jn","요한3서":"3jn",
-    "유다서":"jud","요한계시록":"rev"
-}
-CHAPTER_COUNT = {
-    "창세기":50,"출애굽기":40,"레위기":27,"민수기":36,"신명기":34,"여호수아":24,"사사기":21,"룻기":4,"사무엘상":31,"사무엘하":24,
-    "열왕기상":22,"열왕기하":25,"역대상":29,"역대하":36,"에스라":10,"느헤미야":13,"에스더":10,"욥기":42,"시편":150,"잠언":31,
-    "전도서":12,"아가":8,"이사야":66,"예레미야":52,"예레미야애가":5,"에스겔":48,"다니엘":12,"호세아":14,"요엘":3,"아모스":9,
-    "오바댜":1,"요나":4,"미가":7,"나훔":3,"하박국":3,"스바냐":3,"학개":2,"스가랴":14,"말라기":4,
-    "마태복음":28,"마가복음":16,"누가복음":24,"요한복음":21,"사도행전":28,"로마서":16,"고린도전서":16,"고린도후서":13,"갈라디아서":6,"에베소서":6,
-    "빌립보서":4,"골로새서":4,"데살로니가전서":5,"데살로니가후서":3,"디모데전서":6,"디모데후서":4,"디도서":3,"빌레몬서":1,"히브리서":13,"야고보서":5,
-    "베드로전서":5,"베드로후서":3,"요한1서":5,"요한2서":1,"요한3서":1,"유다서":1,"요한계시록":22
-}
-
 # ---------------------------
 # 랜딩 (권한/접근)
 # ---------------------------
@@ -167,68 +141,11 @@ st.markdown(
     f"{st.session_state.role} · {role_badge}"
 )
 
-# ---------------------------
-# GitHub 유틸
-# ---------------------------
-def _gh_headers():
-    return {
-        "Authorization": f"token {st.secrets['GITHUB_TOKEN']}",
-        "Accept": "application/vnd.github+json",
-    }
-
-def _gh_api_base():
-    owner = st.secrets["GITHUB_OWNER"]
-    repo = st.secrets["GITHUB_REPO"]
-    return f"https://api.github.com/repos/{owner}/{repo}"
-
-def gh_put_bytes(path: str, content_bytes: bytes, message: str):
-    api = _gh_api_base()
-    url = f"{api}/contents/{path}"
-    get = requests.get(url, headers=_gh_headers())
-    sha = get.json().get("sha") if get.status_code == 200 else None
-    b64 = base64.b64encode(content_bytes).decode("utf-8")
-    payload = {
-        "message": message,
-        "content": b64,
-        "branch": st.secrets.get("GITHUB_BRANCH", "main"),
-    }
-    if sha:
-        payload["sha"] = sha
-    r = requests.put(url, headers=_gh_headers(), json=payload)
-    if r.status_code not in (200, 201):
-        raise RuntimeError(f"GitHub 업로드 실패: {r.status_code} {r.text}")
-    return r.json()
-
-def gh_get_bytes(path: str) -> bytes:
-    api = _gh_api_base()
-    url = f"{api}/contents/{path}"
-    r = requests.get(url, headers=_gh_headers())
-    if r.status_code != 200:
-        raise FileNotFoundError(f"GitHub 파일 없음: {path}")
-    content = r.json()["content"]
-    return base64.b64decode(content)
-
-def gh_list_dir(path: str):
-    api = _gh_api_base()
-    url = f"{api}/contents/{path}"
-    r = requests.get(url, headers=_gh_headers())
-    if r.status_code != 200:
-        return []
-    return r.json()
-
 # ---------------------------
 # 자료 유틸
 # ---------------------------
 def add_material():
-    st.session_state.materials.append({
-        "id": str(uuid.uuid4()),
-        "kind": "성경 구절",
-        "files": [],
-        "file": None,
-        "verse_text": "",
-        "description": "",
-        "full_text": ""
-    })
+    st.session_state.materials.append(mat.new_material())
 
 def remove_material(mid: str):
     st.session_state.materials = [m for m in st.session_state.materials if m["id"] != mid]
@@ -247,39 +164,74 @@ def move_material(mid: str, direction: str):
         st.session_state.materials = mats
         st.rerun()
 
-def add_rich_text(paragraph, text: str):
-    if not text:
-        return
-    pattern = r'(\*\*.*?\*\*|==.*?==)'
-    parts = re.split(pattern, text)
-    for part in parts:
-        if not part:
-            continue
-        if part.startswith("**") and part.endswith("**"):
-            run = paragraph.add_run(part[2:-2])
-            run.bold = True
-        elif part.startswith("==") and part.endswith("=="):
-            run = paragraph.add_run(part[2:-2])
-            try:
-                run.font.highlight_color = WD_COLOR_INDEX.YELLOW
-            except Exception:
-                pass
-        else:
-            paragraph.add_run(part)
-
 # ---------------------------
 # 성경 JSON 로더 + 피커 위젯
 # ---------------------------
 @st.cache_data(show_spinner=False, ttl=60*30)
-def load_chapter_json_from_github(book_code: str, chap: int) -> Dict[str, Any]:
-    json_path = f"{BIBLE_JSON_DIR}/{book_code}_{chap:03d}.json"
-    return json.loads(gh_get_bytes(json_path).decode("utf-8"))
+def load_compact_book_from_github(book_code: str) -> Optional[Dict[str, Any]]:
+    return bible.load_compact_book(book_code)
+
+@st.cache_data(show_spinner=False, ttl=60*30)
+def load_chapter_file_from_github(book_code: str, chap: int) -> Dict[str, Any]:
+    return bible.load_chapter_file(book_code, chap)
+
+@st.cache_data(show_spinner=False, ttl=60*60*6, max_entries=2000)
+def load_thumbnail(image_key: str, _f: Dict[str, Any]) -> Optional[bytes]:
+    # 이미지 키(sha1, 없으면 경로)로만 캐시 — 같은 이미지는 제출본이 달라도 한 번만 받는다
+    return mat.material_thumbnail(_f)
+
+@st.cache_data(show_spinner=False, max_entries=200)
+def make_upload_thumbnail(file_id: str, _uploaded) -> bytes:
+    _uploaded.seek(0)
+    return thumbnails.make_thumbnail(_uploaded)
+
+def thumbnail_of(f) -> Optional[bytes]:
+    """저장된 파일(메타 dict)은 저장된 썸네일, 방금 올린 파일은 바로 만든 썸네일. 없으면 None."""
+    if not PIL_AVAILABLE:
+        return None
+    try:
+        if isinstance(f, dict) and "path" in f:
+            return load_thumbnail(mat.image_key(f), f)
+        if hasattr(f, "getvalue"):
+            return make_upload_thumbnail(getattr(f, "file_id", None) or f.name, f)
+    except Exception:
+        pass
+    return None
+
+def show_thumbnails(files: List[Any], width: int = 120, build_key: Optional[str] = None):
+    """썸네일 표시. 저장된 썸네일이 없는 예전 파일은 build_key가 있을 때(편집 권한)만 만들기 버튼을 보여 준다."""
+    if not PIL_AVAILABLE:
+        return
+    shown, missing = [], []
+    for f in files:
+        t = thumbnail_of(f)
+        if t:
+            shown.append((t, f.get("name") if isinstance(f, dict) else getattr(f, "name", "")))
+        elif isinstance(f, dict) and "path" in f:
+            missing.append(f)
+    if shown:
+        st.image([t for t, _ in shown], caption=[name for _, name in shown], width=width)
+    if not missing:
+        return
+    if build_key and st.button(f"🖼 썸네일 만들기 ({len(missing)}장)", key=build_key):
+        with st.spinner("원본 이미지로 썸네일을 만드는 중..."):
+            for f in missing:
+                mat.build_missing_thumbnail(f)
+        load_thumbnail.clear()
+        st.rerun()
+    st.caption(f"썸네일 없음 {len(missing)}장")
+
+@st.cache_data(show_spinner=False, ttl=60*5)
+def load_search_lookup() -> Dict[str, Any]:
+    return search_index.build_lookup(search_index.load_records())
 
-def get_book_code(book_name: str) -> str:
-    code = BOOKS.get(book_name)
-    if not code:
-        raise ValueError(f"알 수 없는 책 이름: {book_name}")
-    return code
+def load_chapter_json_from_github(book_code: str, chap: int, version: Optional[str] = None) -> Dict[str, Any]:
+    book = load_compact_book_from_github(book_code)
+    if book:
+        chapter = bible_compact.chapter_from_compact(book, chap, version)
+        if chapter:
+            return chapter
+    return load_chapter_file_from_github(book_code, chap)
 
 def render_bible_picker(item: Dict[str, Any], disabled: bool):
     st.markdown("**📖 성경 선택**")
@@ -298,11 +250,24 @@ def render_bible_picker(item: Dict[str, Any], disabled: bool):
         chap = st.number_input("장", min_value=1, max_value=max_chap, step=1,
                                key=f"bible_chap_{item['id']}", disabled=disabled)
 
+    # 설치된 번역본이 둘 이상이면 나란히 보기용 번역본 선택
+    book = None
+    try:
+        book = load_compact_book_from_github(book_code)
+    except Exception:
+        pass
+    available = (book or {}).get("versions") or []
+    if len(available) > 1 and bible_compact.chapter_span(book, int(chap)):
+        versions = st.multiselect("번역본", options=available, default=available[:1],
+                                  key=f"bible_versions_{item['id']}", disabled=disabled) or available[:1]
+    else:
+        versions = available[:1]
+
     # 절 범위 계산을 위해 해당 장 로드
     data = None
     try:
-        data = load_chapter_json_from_github(book_code, int(chap))
-        max_verse = len(data.get("verses", [])) or 1
+        data = load_chapter_json_from_github(book_code, int(chap), versions[0] if versions else None)
+        max_verse = max((v.get("verse") or 0 for v in data.get("verses", [])), default=0) or 1
     except Exception as e:
         st.error(f"성경 본문 로드 실패: {e}")
         max_verse = 1
@@ -317,16 +282,28 @@ def render_bible_picker(item: Dict[str, Any], disabled: bool):
                                    key=f"bible_v_to_{item['id']}", disabled=disabled)
 
     preview = ""
-    if data:
-        verses = data.get("verses", [])
-        lines = []
-        for v in verses:
-            vn = v.get("verse")
-            if vn is not None and v_from <= vn <= v_to:
-                lines.append(f"{book_name} {int(chap)}:{vn} {v.get('text','').strip()}")
-        preview = "\n".join(lines)
+    if data and len(versions) > 1:
+        # 모든 번역본이 같은 절 ID로 정렬되어 있어 범위를 한 번에 읽는다
+        rows = bible_compact.read_range(book, int(chap), int(v_from), int(v_to), versions)
+        preview = "\n".join(bible.parallel_verse_lines(book_name, int(chap), rows, versions))
+
+        pcols = st.columns(len(versions))
+        for col, ver in zip(pcols, versions):
+            with col:
+                # key가 있는 위젯은 value= 변경을 무시하므로 state에 직접 넣어 선택한 범위를 그대로 보여 줌
+                preview_key = f"bible_preview_{ver}_{item['id']}"
+                st.session_state[preview_key] = "\n".join(f"{r['verse']} {(r[ver] or '').strip()}" for r in rows)
+                st.text_area(f"미리보기 ({ver})", height=140, disabled=True, key=preview_key)
+    else:
+        if data:
+            preview = "\n".join(bible.verse_lines(book_name, int(chap), data, v_from, v_to))
 
-    st.text_area("미리보기", value=preview, height=140, disabled=True)
+        preview_key = f"bible_preview_{item['id']}"
+        st.session_state[preview_key] = preview
+        st.text_area("미리보기", height=140, disabled=True, key=preview_key)
+    notes = [f for f in (data or {}).get("footnotes", []) if v_from <= f["verse"] <= v_to and f.get("note")]
+    if notes:
+        st.caption(" · ".join(f"{int(chap)}:{f['verse']} {f['n']}) {f['anchor']} — {f['note']}" for f in notes))
 
     # 🔁 버튼 하나만: 말씀 추가 → 본문 내용(verse_text)에 이어붙이기
     if st.button("📥 말씀 추가", key=f"bible_insert_{item['id']}", disabled=disabled):
@@ -343,202 +320,40 @@ def render_bible_picker(item: Dict[str, Any], disabled: bool):
             st.warning("추가할 본문이 없습니다. 책/장/절을 확인해 주세요.")
 
 # ---------------------------
-# 파일 업로드 보조(메타데이터화)
-# ---------------------------
-def sanitize_filename(name: str) -> str:
-    name = os.path.basename(name or "upload.bin")
-    return name.replace("/", "_").replace("\\", "_").strip()
-
-def _sha1(b: bytes) -> str:
-    return hashlib.sha1(b).hexdigest()
-
-def upload_streamlit_file_to_github(uploaded_file, dest_dir: str, msg_prefix: str = "[file]") -> dict:
-    if uploaded_file is None:
-        return {}
-    data = uploaded_file.getvalue()
-    sha1 = _sha1(data)
-    orig_name = getattr(uploaded_file, "name", "upload.bin")
-    safe_name = sanitize_filename(orig_name)
-    dest_path = f"{dest_dir}/{sha1[:10]}_{safe_name}"
-    gh_put_bytes(dest_path, data, message=f"{msg_prefix} upload {safe_name}")
-    return {
-        "name": orig_name,
-        "path": dest_path,
-        "size": len(data),
-        "content_type": getattr(uploaded_file, "type", mimetypes.guess_type(orig_name)[0]),
-        "sha1": sha1,
-    }
-
-def materials_upload_and_detach_files(materials: List[Dict[str, Any]], files_dir: str, msg_prefix: str) -> List[Dict[str, Any]]:
-    out = []
-    for m in materials:
-        m2 = deepcopy(m)
-        kind = m2.get("kind", "")
-
-        if kind == "이미지":
-            metas = []
-            files = m2.get("files") or []
-            for f in files:
-                if hasattr(f, "getvalue"):  # UploadedFile
-                    metas.append(upload_streamlit_file_to_github(f, files_dir, msg_prefix))
-                elif isinstance(f, dict) and "path" in f:
-                    metas.append(f)
-            m2["files"] = metas
-            m2["file"] = None
-
-        elif kind == "기타 파일":
-            f = m2.get("file")
-            if hasattr(f, "getvalue"):
-                m2["file"] = upload_streamlit_file_to_github(f, files_dir, msg_prefix)
-            elif isinstance(f, dict) and "path" in f:
-                pass
-            else:
-                m2["file"] = None
-
-        else:
-            if "files" in m2 and not isinstance(m2["files"], list):
-                m2["files"] = []
-            if "file" in m2 and not isinstance(m2["file"], (dict, type(None))):
-                m2["file"] = None
-
-        out.append(m2)
-    return out
-
-# ---------------------------
-# build_docx
-# ---------------------------
-def build_docx(worship_date: date, services: List[str], materials: List[Dict[str, Any]],
-               user_name: str, position: str, role: str) -> bytes:
-    if Document is None:
-        raise RuntimeError("python-docx가 설치되지 않았습니다. 'pip install python-docx' 실행 후 다시 시도해주세요.")
-    doc = Document()
-
-    style = doc.styles['Normal']
-    style.font.name = '맑은 고딕'
-    style.font.size = Pt(11)
-
-    title = doc.add_paragraph()
-    run = title.add_run("설교 자료")
-    run.bold = True
-    run.font.size = Pt(20)
-    title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-    meta = doc.add_paragraph()
-    meta.add_run(f"날짜: {worship_date.strftime('%Y-%m-%d')}\n").bold = True
-    meta.add_run("예배 구분: " + (", ".join(services) if services else "(미선택)") + "\n").bold = True
-    if user_name or position or role:
-        meta.add_run(f"작성자/권한: {user_name or '(미입력)'} ({position or '직분 미선택'}) - {role or '권한 미지정'}").bold = True
-
-    doc.add_paragraph("")
-    doc.add_heading("자료 (스토리보드)", level=1)
-
-    if not materials:
-        doc.add_paragraph("(추가된 자료가 없습니다)")
-    else:
-        for idx, item in enumerate(materials, start=1):
-            kind = item.get("kind", "")
-            verse_text = item.get("verse_text", "") or ""
-            description = item.get("description", "") or ""
-            full_text = item.get("full_text", "") or ""
-            files = item.get("files", []) or []
-            single_file = item.get("file")
-
-            doc.add_heading(f"{idx}. {kind}", level=2)
-
-            if kind == "성경 구절":
-                if verse_text.strip():
-                    for line in verse_text.splitlines():
-                        p = doc.add_paragraph()
-                        add_rich_text(p, line)
-                    doc.add_paragraph("")
-                else:
-                    doc.add_paragraph("(성경 구절 미입력)")
-
-            elif kind == "이미지":
-                if files:
-                    for f in files:
-                        try:
-                            if isinstance(f, dict) and "path" in f:
-                                img_bytes = gh_get_bytes(f["path"])
-                                _, ext = os.path.splitext(f.get("name") or f["path"])
-                                with tempfile.NamedTemporaryFile(delete=False, suffix=ext or ".img") as tmp:
-                                    tmp.write(img_bytes)
-                                    tmp.flush()
-                                    doc.add_picture(tmp.name, width=Inches(5))
-                            elif hasattr(f, "getvalue"):
-                                with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(getattr(f, "name", ""))[1]) as tmp:
-                                    tmp.write(f.getvalue())
-                                    tmp.flush()
-                                    doc.add_picture(tmp.name, width=Inches(5))
-                        except Exception:
-                            doc.add_paragraph(
-                                f"(이미지 삽입 실패) 파일: "
-                                f"{(f.get('name') if isinstance(f, dict) else getattr(f, 'name', 'unknown'))}"
-                            )
-                else:
-                    doc.add_paragraph("(이미지 파일 없음)")
-
-            elif kind == "기타 파일":
-                if isinstance(single_file, dict) and "name" in single_file:
-                    doc.add_paragraph(f"첨부 파일: {single_file['name']} (문서에 직접 삽입되지 않습니다)")
-                elif single_file is not None and hasattr(single_file, "getvalue"):
-                    doc.add_paragraph(f"첨부 파일: {getattr(single_file, 'name', '파일')} (문서에 직접 삽입되지 않습니다)")
-                else:
-                    doc.add_paragraph("(첨부 파일 없음)")
-
-            elif kind == "설교 전문":
-                if full_text.strip():
-                    for line in full_text.splitlines():
-                        p = doc.add_paragraph()
-                        add_rich_text(p, line)
-                else:
-                    doc.add_paragraph("(설교 전문 미입력)")
-
-            p = doc.add_paragraph()
-            p.add_run("설명(스토리보드): ")
-            if description.strip():
-                add_rich_text(p, description)
-            else:
-                p.add_run("(미입력)")
-
-            doc.add_paragraph("")
-
-    buffer = io.BytesIO()
-    doc.save(buffer)
-    buffer.seek(0)
-    return buffer.read()
-
-# ---------------------------
-# 제출 직렬화/역직렬화 + 경로
+# 제출 직렬화/역직렬화 (세션 ↔ payload)
 # ---------------------------
 def serialize_submission():
-    return {
-        "worship_date": str(st.session_state.get("worship_date")),
-        "services": st.session_state.get("services_selected", []),
-        "materials": st.session_state.get("materials", []),
-        "user_name": st.session_state.get("user_name"),
-        "position": st.session_state.get("position"),
-        "role": st.session_state.get("role"),
-        "saved_at": datetime.now(timezone.utc).isoformat()
-    }
+    return submission.serialize_submission(
+        worship_date=st.session_state.get("worship_date"),
+        services=st.session_state.get("services_selected", []),
+        materials=st.session_state.get("materials", []),
+        user_name=st.session_state.get("user_name"),
+        position=st.session_state.get("position"),
+        role=st.session_state.get("role"),
+    )
 
 def load_into_session(payload: dict):
     st.session_state.worship_date = date.fromisoformat(payload.get("worship_date"))
     st.session_state.services_selected = payload.get("services", [])
     st.session_state.materials = payload.get("materials", [])
 
-def gh_paths(user_name: str, worship_date: date, submission_id: str = None):
-    base = st.secrets.get("GITHUB_BASE_DIR", "worship_submissions")
-    d = worship_date.strftime("%Y-%m-%d")
-    safe_user = (user_name or "unknown").strip().replace("/", "_")
-    sub_id = "draft" if submission_id is None else submission_id
-    folder = f"{base}/{d}/{safe_user}/{sub_id}"
-    return {
-        "folder": folder,
-        "files_dir": f"{folder}/files",
-        "json": f"{folder}/submission.json",
-        "docx": f"{folder}/submission.docx",
-    }
+def adopt_merged_materials(merged: dict, materials_detached: List[Dict[str, Any]]) -> int:
+    """저장 중 다른 화면의 변경이 병합됐다면 세션 자료 목록에 반영. 반영된(새로 생기거나 바뀐) 자료 수를 반환.
+    바뀐 자료의 입력 위젯 상태는 지워 둔다 — 남아 있으면 다음 실행에서 위젯 값이 병합 결과를 덮어쓴다.
+    (이번 실행에서 이미 그려진 위젯이므로 호출한 쪽에서 st.rerun()으로 다시 그려야 화면에 반영됨)"""
+    mine = {m["id"]: m for m in st.session_state.materials}
+    sent = {m["id"]: m for m in materials_detached}
+    adopted, changed = [], 0
+    for m in merged.get("materials", []):
+        if sent.get(m.get("id")) == m:
+            adopted.append(mine[m["id"]])
+        else:
+            adopted.append(m)
+            changed += 1
+            for prefix in ("kind_", "verse_", "full_", "desc_"):
+                st.session_state.pop(f"{prefix}{m.get('id')}", None)
+    st.session_state.materials = adopted
+    return changed
 
 # ---------------------------
 # ① 날짜/예배 선택
@@ -634,6 +449,9 @@ for i, item in enumerate(st.session_state.materials):
                         elif hasattr(f, "name"):
                             names.append(f.name)
                     st.write(", ".join(names) if names else "(목록 없음)")
+                    # 접힌 expander 안도 매번 실행되므로 썸네일은 켰을 때만 받는다
+                    if st.toggle("썸네일 보기", key=f"thumbs_{item['id']}"):
+                        show_thumbnails(existing, build_key=f"mkthumbs_{item['id']}" if can_edit else None)
 
             new_uploads = st.file_uploader(
                 "이미지 업로드 (PNG/JPG) — 여러 장 선택 가능",
@@ -706,7 +524,7 @@ with col1:
 
 if do_save and can_edit:
     try:
-        docx_bytes = build_docx(
+        docx_bytes = docx_render.build_docx(
             worship_date=worship_date,
             services=services,
             materials=st.session_state.materials,
@@ -725,6 +543,22 @@ if do_save and can_edit:
     except Exception as e:
         st.error(f"문서 생성 중 오류가 발생했습니다: {e}")
 
+with col2:
+    do_slides = st.button("🖼 슬라이드(PNG) 내보내기", disabled=(not can_edit or not PIL_AVAILABLE))
+
+if do_slides and can_edit:
+    try:
+        with st.spinner("슬라이드를 렌더링하는 중..."):
+            slides_zip = slides.build_slides_zip(st.session_state.materials, font_path=SLIDE_FONT_PATH)
+        st.download_button(
+            "⬇️ 슬라이드 다운로드 (ZIP)",
+            data=slides_zip,
+            file_name=f"슬라이드_{worship_date.strftime('%Y%m%d')}_{'-'.join(services) if services else '미지정'}.zip",
+            mime="application/zip",
+        )
+    except Exception as e:
+        st.error(f"슬라이드 생성 중 오류가 발생했습니다: {e}")
+
 st.divider()
 
 # ---------------------------
@@ -739,19 +573,27 @@ with b2:
 with b3:
     submit_now = st.button("✅ 제출", disabled=not can_edit)
 
+if notice := st.session_state.pop("merge_notice", None):
+    st.info(notice)
+
 if save_draft and can_edit:
     try:
         p = gh_paths(st.session_state.user_name, worship_date)  # draft
-        materials_detached = materials_upload_and_detach_files(
+        materials_detached = mat.materials_upload_and_detach_files(
             st.session_state.materials, p["files_dir"], msg_prefix="[draft-files]"
         )
         data = serialize_submission()
         data["materials"] = materials_detached
-        gh_put_bytes(
-            p["json"],
-            json.dumps(data, ensure_ascii=False).encode("utf-8"),
+        merged = submission.write_submission_json(
+            p["json"], data, st.session_state.remote_bases.get(p["json"]),
             message=f"[draft] {st.session_state.user_name} {worship_date} 저장"
         )
+        st.session_state.remote_bases[p["json"]] = merged
+        n_merged = adopt_merged_materials(merged, materials_detached)
+        if n_merged:
+            # 합친 내용이 입력란에 보이도록 다시 그림 — 안내는 다음 실행에서 표시
+            st.session_state.merge_notice = f"임시 저장되었습니다. 다른 창에서 저장된 자료 {n_merged}개를 합쳤습니다."
+            st.rerun()
         st.success("임시 저장되었습니다. (GitHub)")
     except Exception as e:
         st.error(f"임시 저장 실패: {e}")
@@ -762,6 +604,7 @@ if load_draft and can_edit:
         draft_bytes = gh_get_bytes(p["json"])
         payload = json.loads(draft_bytes.decode("utf-8"))
         load_into_session(payload)
+        st.session_state.remote_bases[p["json"]] = payload
         st.success("임시 저장본을 불러왔습니다.")
         st.rerun()
     except Exception as e:
@@ -773,29 +616,31 @@ if submit_now and can_edit:
         st.session_state.submission_id = sub_id
         p = gh_paths(st.session_state.user_name, worship_date, submission_id=sub_id)
 
-        materials_detached = materials_upload_and_detach_files(
+        materials_detached = mat.materials_upload_and_detach_files(
             st.session_state.materials, p["files_dir"], msg_prefix="[submit-files]"
         )
 
-        docx_bytes = build_docx(
-            worship_date=worship_date,
-            services=st.session_state.services_selected,
-            materials=st.session_state.materials,
-            user_name=st.session_state.user_name,
-            position=st.session_state.position,
-            role=st.session_state.role
-        )
-
         data = serialize_submission()
         data["status"] = "submitted"
         data["submission_id"] = sub_id
         data["materials"] = materials_detached
 
-        gh_put_bytes(
-            p["json"],
-            json.dumps(data, ensure_ascii=False).encode("utf-8"),
+        data = submission.write_submission_json(
+            p["json"], data, st.session_state.remote_bases.get(p["json"]),
             message=f"[submit] {st.session_state.user_name} {worship_date} 제출"
         )
+        st.session_state.remote_bases[p["json"]] = data
+        n_merged = adopt_merged_materials(data, materials_detached)
+
+        # 병합 결과(세션 자료)로 DOCX를 만들어 JSON과 내용이 어긋나지 않게 함
+        docx_bytes = docx_render.build_docx(
+            worship_date=worship_date,
+            services=st.session_state.services_selected,
+            materials=st.session_state.materials,
+            user_name=st.session_state.user_name,
+            position=st.session_state.position,
+            role=st.session_state.role
+        )
         gh_put_bytes(
             p["docx"],
             docx_bytes,
@@ -804,6 +649,15 @@ if submit_now and can_edit:
         st.success("제출 완료! 미디어부 화면에서 확인 가능합니다.")
     except Exception as e:
         st.error(f"제출 실패: {e}")
+    else:
+        try:
+            search_index.index_submission(data, p["folder"])
+            load_search_lookup.clear()
+        except Exception as e:
+            st.warning(f"검색 색인 갱신 실패 (제출은 완료됨): {e}")
+        if n_merged:
+            st.session_state.merge_notice = f"제출 완료! 다른 창에서 제출된 자료 {n_merged}개를 합쳤습니다."
+            st.rerun()
 
 st.divider()
 
@@ -812,15 +666,39 @@ st.divider()
 # ---------------------------
 if st.session_state.role == "미디어부":
     st.markdown("### 📬 제출함(미디어부) — 날짜별/제출자별 목록")
-    base = st.secrets.get("GITHUB_BASE_DIR", "worship_submissions")
+    base = storage.base_dir()
     days = gh_list_dir(base)
     if not days:
         st.info("아직 제출된 자료가 없습니다.")
     else:
-        day_names = sorted([d["name"] for d in days if d.get("type") == "dir"], reverse=True)
+        day_names = sorted([d["name"] for d in days
+                            if d.get("type") == "dir" and d["name"] != search_index.INDEX_DIR_NAME], reverse=True)
         sel_day = st.selectbox("날짜 선택", options=day_names)
         if sel_day:
             day_dir = f"{base}/{sel_day}"
+            if st.button("📦 이 날짜 전체 ZIP 만들기", key=f"zip_{sel_day}"):
+                try:
+                    # download_button은 데이터를 서버 메모리에 통째로 올리므로 크기 상한을 두고,
+                    # 만드는 동안은 임시 파일에 기록했다가 다 만든 뒤 한 번만 읽는다
+                    with st.spinner("제출물을 모으는 중..."), tempfile.TemporaryFile() as zip_tmp:
+                        n_files = export.write_day_zip(day_dir, zip_tmp, max_bytes=export.zip_download_max())
+                        zip_tmp.seek(0)
+                        zip_bytes = zip_tmp.read()
+                    st.download_button(
+                        f"⬇️ 전체 다운로드 (ZIP, {n_files}개 파일)",
+                        data=zip_bytes,
+                        file_name=f"설교자료_{sel_day}_전체.zip",
+                        mime="application/zip",
+                        key=f"dlzip_{sel_day}",
+                    )
+                except export.ZipTooLarge as e:
+                    st.error(f"{e} 제출자별 Word/첨부 파일을 따로 내려받아 주세요. (상한: ZIP_DOWNLOAD_MAX_MB 설정)")
+                except Exception as e:
+                    st.error(f"ZIP 생성 오류: {e}")
+
+            # 통합 순서지 선택기는 아래 제출 목록을 그리면서 모은 예배로 채움 (목록보다 위에 보이도록 자리만 먼저 잡음)
+            master_box = st.container()
+            day_services = set()
             users = gh_list_dir(day_dir) or []
             for u in users:
                 if u.get("type") != "dir":
@@ -841,14 +719,36 @@ if st.session_state.role == "미디어부":
                             if json_item:
                                 try:
                                     payload = json.loads(gh_get_bytes(json_item["path"]).decode("utf-8"))
+                                    if s["name"] != "draft":
+                                        day_services.update(payload.get("services") or ["(미지정)"])
                                     info = (
                                         f"- 예배: {', '.join(payload.get('services', [])) or '(미지정)'}\n"
                                         f"- 자료개수: {len(payload.get('materials', []))}\n"
                                         f"- 제출시각(UTC): {payload.get('saved_at','')}\n"
                                     )
                                     st.caption(info)
+                                    images = [
+                                        f for m in payload.get("materials", []) if m.get("kind") == "이미지"
+                                        for f in m.get("files") or [] if isinstance(f, dict)
+                                    ]
+                                    # 읽기 전용 화면: 켰을 때 저장된 썸네일만 받고, 없는 썸네일을 만들어 저장하지 않음
+                                    if images and st.toggle(f"🖼 이미지 {len(images)}장 미리보기",
+                                                            key=f"th_{sel_day}_{u['name']}_{s['name']}"):
+                                        show_thumbnails(images, width=96)
                                 except Exception:
                                     st.caption("메타 로드 실패")
+                                if PIL_AVAILABLE and st.button("🖼 슬라이드", key=f"sl_{sel_day}_{u['name']}_{s['name']}"):
+                                    try:
+                                        payload = json.loads(gh_get_bytes(json_item["path"]).decode("utf-8"))
+                                        st.download_button(
+                                            "⬇️ 슬라이드(ZIP)",
+                                            data=slides.build_slides_zip(payload.get("materials", []), font_path=SLIDE_FONT_PATH),
+                                            file_name=f"슬라이드_{sel_day}_{u['name']}_{s['name']}.zip",
+                                            mime="application/zip",
+                                            key=f"dlsl_{sel_day}_{u['name']}_{s['name']}"
+                                        )
+                                    except Exception as e:
+                                        st.error(f"슬라이드 오류: {e}")
                             else:
                                 st.caption("메타 없음")
                         with c3:
@@ -865,11 +765,11 @@ if st.session_state.role == "미디어부":
                                 except Exception as e:
                                     st.error(f"다운로드 오류: {e}")
                             else:
-                                if json_item and Document is not None:
+                                if json_item and DOCX_AVAILABLE:
                                     if st.button("📄 즉석 Word 생성", key=f"mk_{sel_day}_{u['name']}_{s['name']}"):
                                         try:
                                             payload = json.loads(gh_get_bytes(json_item["path"]).decode("utf-8"))
-                                            docx_bytes2 = build_docx(
+                                            docx_bytes2 = docx_render.build_docx(
                                                 worship_date=date.fromisoformat(sel_day),
                                                 services=payload.get("services", []),
                                                 materials=payload.get("materials", []),
@@ -887,6 +787,103 @@ if st.session_state.role == "미디어부":
                                         except Exception as e:
                                             st.error(f"생성 오류: {e}")
 
+            # 예배 목록은 그날 실제 제출본에서 — 직접 입력한 예배(예: 청년예배)도 따로 고를 수 있게.
+            # 제출본 전체는 버튼을 눌렀을 때만 읽음
+            with master_box:
+                mc1, mc2 = st.columns([1, 2])
+                with mc1:
+                    master_service = st.selectbox(
+                        "통합 순서지 예배", options=["전체"] + sorted(day_services, key=submission.service_sort_key),
+                        key=f"master_svc_{sel_day}"
+                    )
+                with mc2:
+                    st.write("")
+                    make_master = st.button("🗂 통합 순서지 만들기", key=f"master_{sel_day}", disabled=not DOCX_AVAILABLE)
+                if make_master:
+                    try:
+                        with st.spinner("통합 순서지를 만드는 중..."):
+                            svc = None if master_service == "전체" else master_service
+                            master_bytes = docx_render.build_master_docx(
+                                date.fromisoformat(sel_day), submission.load_day_submissions(day_dir), service=svc
+                            )
+                        st.download_button(
+                            "⬇️ 통합 순서지 다운로드",
+                            data=master_bytes,
+                            file_name=f"통합순서지_{sel_day}_{master_service}.docx",
+                            mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                            key=f"dlmaster_{sel_day}",
+                        )
+                    except Exception as e:
+                        st.error(f"통합 순서지 생성 오류: {e}")
+
+st.divider()
+
+# ---------------------------
+# ⑥ 지난 제출 검색 (색인 기반)
+# ---------------------------
+st.markdown("#### 🔎 지난 제출 검색")
+with st.expander("검색 조건", expanded=False):
+    q1, q2, q3 = st.columns(3)
+    with q1:
+        q_ref = st.text_input("성경 본문", placeholder="예: 요 3:16, 창세기 1", key="q_ref")
+        q_kind = st.selectbox("자료 유형", options=["전체"] + mat.MATERIAL_KINDS, key="q_kind")
+    with q2:
+        q_user = st.text_input("작성자 이름", key="q_user")
+        # 예배 목록은 색인에 실제로 있는 예배에서 — 직접 입력한 예배(예: 청년예배)도 고를 수 있게
+        try:
+            indexed_services = sorted(load_search_lookup()["by_service"], key=submission.service_sort_key)
+        except Exception:
+            indexed_services = BASE_SERVICES
+        q_service = st.selectbox("예배", options=["전체"] + indexed_services, key="q_service")
+    with q3:
+        q_file = st.text_input("파일 이름 또는 sha1", key="q_file")
+        q_range = st.date_input("기간", value=(), key="q_range")
+    do_search = st.button("검색", key="q_go")
+
+    if do_search:
+        try:
+            with st.spinner("색인을 불러오는 중..."):
+                lookup = load_search_lookup()
+            date_from = q_range[0] if len(q_range) > 0 else None
+            date_to = q_range[1] if len(q_range) > 1 else None
+            results = search_index.search(
+                lookup,
+                reference=q_ref,
+                user_name=q_user.strip(),
+                service="" if q_service == "전체" else q_service,
+                date_from=date_from,
+                date_to=date_to,
+                file_query=q_file,
+                kind="" if q_kind == "전체" else q_kind,
+            )
+            if q_ref.strip() and bible.parse_reference(q_ref) is None:
+                st.warning("성경 본문을 알아볼 수 없습니다. 예: 요 3:16, 창세기 1:1-5")
+            st.caption(f"{len(results)}건 (색인된 제출본 {len(lookup['records'])}건 중)")
+            st.dataframe(
+                [{
+                    "날짜": r["date"],
+                    "작성자": r["user_name"],
+                    "직분": r["position"],
+                    "예배": ", ".join(r["services"]),
+                    "본문": ", ".join(search_index.format_ref(x) for x in r["refs"]),
+                    "파일": ", ".join(f["name"] or "" for f in r["files"]),
+                    "제출 ID": r["submission_id"],
+                } for r in results],
+                use_container_width=True,
+                hide_index=True,
+            )
+        except Exception as e:
+            st.error(f"검색 오류: {e}")
+
+    if st.session_state.role == "미디어부" and st.button("♻️ 색인 다시 만들기", key="q_rebuild"):
+        try:
+            with st.spinner("모든 제출본을 읽어 색인을 다시 만드는 중..."):
+                n_indexed = search_index.rebuild_index()
+            load_search_lookup.clear()
+            st.success(f"색인을 다시 만들었습니다. ({n_indexed}건)")
+        except Exception as e:
+            st.error(f"색인 생성 오류: {e}")
+
 # ---------------------------
 # 풋터
 # ---------------------------
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+테스트 공용: 로컬 GitHub 대역 서버(ch2.fake_github)와 그 서버를 쓰는 앱(AppTest) 세션
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("streamlit.testing.v1")
+from streamlit.testing.v1 import AppTest
+
+from ch2 import fake_github
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "ch_test.py")
+BASE_DIR = "test_submissions"
+
+
+@pytest.fixture(autouse=True)
+def clear_app_caches():
+    # st.cache_data는 프로세스 전역 — 테스트마다 대역 서버가 새로 뜨므로 이전 테스트의 결과를 지움
+    import streamlit as st
+    st.cache_data.clear()
+
+
+@pytest.fixture
+def gh():
+    server_gh = fake_github.FakeGitHub()
+    server_gh.seed(os.path.join(ROOT, "bsk_compact"))  # 새 자료의 기본 유형(성경 구절)이 본문을 읽음
+    server = fake_github.serve(server_gh)
+    server_gh.api_url = f"http://127.0.0.1:{server.server_port}"
+    yield server_gh
+    server.shutdown()
+
+
+@pytest.fixture
+def open_app(gh):
+    """역할을 골라 입장까지 마친 AppTest를 돌려주는 함수."""
+    def _open(role: str = "교역자", name: str = "테스트") -> AppTest:
+        at = AppTest.from_file(APP_PATH, default_timeout=60)
+        for k, v in {"GITHUB_API_URL": gh.api_url, "GITHUB_TOKEN": "test", "GITHUB_OWNER": "test",
+                     "GITHUB_REPO": "test", "GITHUB_BASE_DIR": BASE_DIR}.items():
+            at.secrets[k] = v
+        at.run()
+        at.radio[0].set_value(role)
+        at.text_input[0].input(name)
+        at.text_input[1].input("0001")
+        at.button[0].click().run()
+        assert not at.exception
+        return at
+    return _open
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+성경 선택기 미리보기가 고른 범위(장/절)를 따라가는지 확인 — '말씀 추가'로 들어가는 본문과 같아야 함
+"""
+
+import json
+
+import pytest
+
+
+def button(at, label: str):
+    return next(b for b in at.button if b.label == label)
+
+
+@pytest.fixture
+def two_version_gh(gh):
+    """창세기 압축본에 두 번째 번역본 열(TEST)을 덧붙인다."""
+    path = "bsk_compact/gen.json"
+    book = json.loads(gh.files[path].decode("utf-8"))
+    first = book["versions"][0]
+    book["versions"].append("TEST")
+    book["text"]["TEST"] = [f"(TEST) {t}" if t else t for t in book["text"][first]]
+    gh.files[path] = json.dumps(book, ensure_ascii=False).encode("utf-8")
+    return gh
+
+
+def test_parallel_previews_follow_verse_range(two_version_gh, open_app):
+    at = open_app()
+    button(at, "+ 자료 추가").click().run()
+    mid = at.session_state.materials[0]["id"]
+    at.multiselect(key=f"bible_versions_{mid}").set_value(["GAE", "TEST"]).run()
+    at.number_input(key=f"bible_v_to_{mid}").set_value(3).run()
+    assert not at.exception
+
+    for ver in ("GAE", "TEST"):
+        preview = at.text_area(key=f"bible_preview_{ver}_{mid}").value
+        assert [line.split(" ", 1)[0] for line in preview.splitlines()] == ["1", "2", "3"]
+    assert at.text_area(key=f"bible_preview_TEST_{mid}").value.startswith("1 (TEST) ")
+
+    button(at, "📥 말씀 추가").click().run()
+    assert "창세기 1:3" in at.session_state.materials[0]["verse_text"]
+
+
+def test_preview_follows_verse_range_and_chapter(open_app):
+    at = open_app()
+    button(at, "+ 자료 추가").click().run()
+    mid = at.session_state.materials[0]["id"]
+
+    def preview() -> str:
+        return at.text_area(key=f"bible_preview_{mid}").value
+
+    assert preview().startswith("창세기 1:1")
+    at.number_input(key=f"bible_v_to_{mid}").set_value(3).run()
+    assert "창세기 1:3" in preview()
+    at.number_input(key=f"bible_chap_{mid}").set_value(2).run()
+    assert preview().startswith("창세기 2:1") and "창세기 1:" not in preview()
+
+    button(at, "📥 말씀 추가").click().run()
+    assert at.session_state.materials[0]["verse_text"] == preview()
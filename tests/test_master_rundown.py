@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+통합 순서지: 같은 작성자가 같은 예배에 따로 낸 제출본(제출 ID가 다름)이 모두 들어가는지 확인
+- 저장소의 che2_submissions/2025-09-28/백지원 — 043405-6dd70b(성경 구절, 2부) · 044329-dd65a4(파일+설교 전문, 2부/3부)
+"""
+
+import glob
+import io
+import json
+import os
+from datetime import date
+
+import pytest
+
+from ch2 import submission
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DAY_DIR = os.path.join(ROOT, "che2_submissions", "2025-09-28")
+
+
+@pytest.fixture
+def payloads():
+    out = []
+    for path in sorted(glob.glob(os.path.join(DAY_DIR, "*", "*", "submission.json"))):
+        if os.sep + "draft" + os.sep not in path:
+            with open(path, encoding="utf-8") as f:
+                out.append(json.load(f))
+    return out
+
+
+def test_group_keeps_every_submission_of_an_author(payloads):
+    grouped = submission.group_submissions_by_service(payloads)
+    assert [p["submission_id"] for p in grouped["2부"]] == ["043405-6dd70b", "044329-dd65a4"]
+    assert [p["submission_id"] for p in grouped["3부"]] == ["044329-dd65a4"]
+    assert list(submission.group_submissions_by_service(payloads, service="2부")) == ["2부"]
+
+
+def test_master_docx_includes_scripture_from_earlier_submission(payloads):
+    pytest.importorskip("docx")
+    from docx import Document
+    from ch2 import docx_render
+
+    data = docx_render.build_master_docx(date(2025, 9, 28), payloads, service="2부")
+    text = "\n".join(p.text for p in Document(io.BytesIO(data)).paragraphs)
+    assert "아담 자손의 계보가 이러하니라" in text
+
+
+def test_inbox_reads_day_payloads_only_on_button(gh, open_app, monkeypatch):
+    from conftest import BASE_DIR
+
+    gh.seed(os.path.join(ROOT, "che2_submissions"), prefix=BASE_DIR)
+    calls = []
+    real = submission.load_day_submissions
+    monkeypatch.setattr(submission, "load_day_submissions", lambda day_dir: calls.append(day_dir) or real(day_dir))
+
+    at = open_app("미디어부")
+    next(sb for sb in at.selectbox if sb.label == "날짜 선택").set_value("2025-09-28").run()
+    assert not at.exception
+    assert at.selectbox(key="master_svc_2025-09-28").options == ["전체", "2부", "3부"]
+    assert calls == []
+
+    at.button(key="master_2025-09-28").click().run()
+    assert calls == [f"{BASE_DIR}/2025-09-28"]
+    assert not at.error
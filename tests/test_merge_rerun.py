@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+다른 창의 변경이 저장 중 병합됐을 때, 다시 그린 화면(입력란)과 세션 자료가 병합 결과를 유지하는지 확인
+- 로컬 GitHub 대역 서버(ch2.fake_github)에 임시 저장 → 서버의 저장본을 직접 고쳐 '다른 창' 흉내 → 이 창에서 다시 저장
+"""
+
+import json
+
+from conftest import BASE_DIR
+
+
+def button(at, label: str):
+    return next(b for b in at.button if b.label == label)
+
+
+def draft_path(gh) -> str:
+    return next(p for p in gh.files if p.startswith(f"{BASE_DIR}/") and p.endswith("/draft/submission.json"))
+
+
+def test_merged_edit_survives_rerun(gh, open_app):
+    at = open_app()
+    button(at, "+ 자료 추가").click().run()
+    button(at, "+ 자료 추가").click().run()
+    first, second = (m["id"] for m in at.session_state.materials)
+    at.text_area(key=f"desc_{first}").input("처음 설명")
+    button(at, "💾 임시 저장").click().run()
+    assert not at.exception and not at.error
+
+    # 다른 창: 첫 자료의 설명을 고쳐 저장
+    path = draft_path(gh)
+    remote = json.loads(gh.files[path].decode("utf-8"))
+    remote["materials"][0]["description"] = "다른 창에서 고친 설명"
+    gh.files[path] = json.dumps(remote, ensure_ascii=False).encode("utf-8")
+
+    # 이 창: 두 번째 자료만 고쳐 저장 → 병합 후 다시 그림
+    at.text_area(key=f"desc_{second}").input("이 창의 설명")
+    button(at, "💾 임시 저장").click().run()
+    assert not at.exception and not at.error
+    assert any("1개를 합쳤습니다" in i.value for i in at.info)
+
+    def assert_merged():
+        assert at.text_area(key=f"desc_{first}").value == "다른 창에서 고친 설명"
+        assert at.text_area(key=f"desc_{second}").value == "이 창의 설명"
+        by_id = {m["id"]: m for m in at.session_state.materials}
+        assert by_id[first]["description"] == "다른 창에서 고친 설명"
+        assert by_id[second]["description"] == "이 창의 설명"
+
+    assert_merged()
+    at.run()  # 이후 실행에서도 남아 있던 위젯 값이 병합 결과를 덮어쓰지 않아야 함
+    assert_merged()
+
+    # 다음 저장도 병합 결과를 그대로 올림
+    button(at, "💾 임시 저장").click().run()
+    saved = json.loads(gh.files[path].decode("utf-8"))
+    assert [m["description"] for m in saved["materials"]] == ["다른 창에서 고친 설명", "이 창의 설명"]
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""
+지난 제출 검색: 예배 선택지가 색인에 있는 예배(직접 입력한 예배 포함)에서 오는지 확인
+"""
+
+from conftest import BASE_DIR
+
+from ch2 import search_index
+
+
+def test_service_options_come_from_index(gh, open_app):
+    payload = {"worship_date": "2025-10-12", "user_name": "홍길동", "services": ["청년예배"],
+               "saved_at": "2025-10-12T01:00:00+00:00", "materials": [{"kind": "성경 구절", "verse_text": "요한복음 3:16"}]}
+    record = search_index.submission_record(payload, f"{BASE_DIR}/2025-10-12/홍길동/010000-abcdef")
+    shard = {"format": search_index.INDEX_FORMAT, "records": {record["key"]: record}}
+    gh.files[f"{BASE_DIR}/{search_index.INDEX_DIR_NAME}/2025-10.json"] = search_index._dump_shard(shard)
+
+    at = open_app("미디어부")
+    assert at.selectbox(key="q_service").options == ["전체", "청년예배"]
+
+    at.selectbox(key="q_service").set_value("청년예배")
+    at.button(key="q_go").click().run()
+    assert not at.error
+    assert any(c.value.startswith("1건") for c in at.caption)